@@ -1 +1,3 @@
 __version__ = '1.0.0'
+
+from .dispatch import classify, classify_many, Rejection  # noqa: F401,E402
@@ -0,0 +1,51 @@
+'''
+Reads sample/samplesheet names from raw byte buffers without copying
+'''
+
+import os
+import re
+
+# directory part of a path (everything up to and including the last slash)
+DIRNAME_REGEX = re.compile(br'(?:(.*)/)?', re.DOTALL)
+
+# entries in NUL or newline delimited buffers
+NUL_REGEX = re.compile(br'\x00')
+NUL_DELIMITED_REGEX = re.compile(br'[^\x00]+')
+LINE_DELIMITED_REGEX = re.compile(br'[^\r\n]+')
+
+
+def split_path(fullname):
+    '''
+    Splits a bytes-like path into its directory (bytes) and
+    the offset at which the name starts
+    '''
+    match = DIRNAME_REGEX.match(fullname)
+    return match.group(1) or b'', match.end()
+
+
+def decode(value):
+    '''
+    Decodes a matched constituent using the filesystem encoding
+    '''
+    if value is None:
+        return None
+    return os.fsdecode(bytes(value))
+
+
+def split_names(buffer, delimiter=None):
+    '''
+    Yields the entries of a NUL (e.g. find -print0) or newline delimited
+    buffer as memoryview slices (zero-copy). The delimiter is inferred
+    from the buffer if not given. Empty entries are skipped.
+    '''
+    view = memoryview(buffer)
+    if delimiter is None:
+        delimiter = b'\0' if NUL_REGEX.search(view) else b'\n'
+    if delimiter == b'\0':
+        regex = NUL_DELIMITED_REGEX
+    elif delimiter == b'\n':
+        regex = LINE_DELIMITED_REGEX
+    else:
+        raise ValueError("Unsupported delimiter ({!r})".format(delimiter))
+    for match in regex.finditer(view):
+        yield view[match.start():match.end()]
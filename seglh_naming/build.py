@@ -0,0 +1,67 @@
+'''
+Builds the sample names of a library preparation from LIMS rows
+'''
+
+from .sample import Sample
+
+# samplecount format (2 digits, 3 digits above 99)
+SAMPLECOUNT_FORMAT = '{:02d}'
+
+
+def _samplecount(value):
+    '''
+    Samplecount of a row as string (integers formatted, e.g. 3 -> '03')
+    '''
+    if isinstance(value, int) and not isinstance(value, bool):
+        return SAMPLECOUNT_FORMAT.format(value)
+    return None if value is None else str(value)
+
+
+def build_samples(rows, libraryprep=None, start=1, cls=Sample):
+    '''
+    Builds and validates a batch of samples from rows of constituents
+    (dicts, e.g. from a LIMS export). Rows are not modified.
+    Integer samplecounts are formatted like assigned ones (3 -> '03').
+        libraryprep: for rows without libraryprep
+        start: first samplecount assigned to rows without samplecount,
+               sequential numbers already used in the batch are skipped
+        cls: sample class (e.g. a strict or variant scheme)
+    Errors of all rows (constituents, requirements such as the TSO length
+    and identifiers, duplicate samplecounts) are aggregated and reported
+    by row number
+    '''
+    rows = list(rows)
+    used = set(_samplecount(row.get('samplecount')) for row in rows)
+    fields = cls._fields
+    samplecount = start
+    samplecounts = {}
+    samples = []
+    collected_errors = []
+    for rownumber, row in enumerate(rows, 1):
+        constituents = dict((field, row.get(field)) for field in fields)
+        constituents['samplecount'] = _samplecount(row.get('samplecount'))
+        if not constituents['libraryprep']:
+            constituents['libraryprep'] = libraryprep
+        if not constituents['samplecount']:
+            while SAMPLECOUNT_FORMAT.format(samplecount) in used:
+                samplecount += 1
+            constituents['samplecount'] = \
+                SAMPLECOUNT_FORMAT.format(samplecount)
+            samplecount += 1
+        try:
+            sample = cls.from_dict(constituents)
+        except ValueError as e:
+            collected_errors.append('Row {}: {}'.format(rownumber, e))
+            continue
+        # samplecount must be unique within library
+        key = (sample.libraryprep, sample.samplecount)
+        if key in samplecounts:
+            collected_errors.append(
+                'Row {}: Duplicate samplecount ({}, see row {})'.format(
+                    rownumber, sample.samplecount, samplecounts[key]))
+            continue
+        samplecounts[key] = rownumber
+        samples.append(sample)
+    if collected_errors:
+        raise ValueError(", ".join(collected_errors))
+    return samples
@@ -0,0 +1,68 @@
+'''
+Classifies any name as Sample, Samplesheet or unknown in a single match
+
+The naming formats are combined into one precompiled alternation (the
+samplesheet format first), the matched alternative selects the class and
+its groups are the constituents. No name is matched twice and unknown
+names do not raise.
+'''
+
+import re
+from collections import namedtuple
+
+from .sample import Sample
+from .samplesheet import Samplesheet
+
+# classes in order of precedence
+NAMINGS = (Samplesheet, Sample)
+
+# rejected name (cls is None if no naming format matched)
+Rejection = namedtuple('Rejection', ['name', 'cls', 'error'])
+
+
+def _combine(namings):
+    '''
+    Combined regular expression and (class, first, last group) per format
+    '''
+    alternatives = []
+    spans = []
+    start = 1
+    for cls in namings:
+        alternatives.append('(?:{})'.format(cls._regex.pattern))
+        spans.append((cls, start, start + cls._regex.groups))
+        start += cls._regex.groups
+    return re.compile('|'.join(alternatives)), spans
+
+
+# combined naming formats
+NAMING_REGEX, NAMING_SPANS = _combine(NAMINGS)
+
+
+def classify(fullname, lazy=False):
+    '''
+    Parses a name (or path) with the first matching naming format
+        Sample, Samplesheet or Rejection
+    '''
+    path, _, name = fullname.rpartition('/')
+    match = NAMING_REGEX.match(name)
+    if not match:
+        return Rejection(fullname, None,
+                         'Wrong naming format ({})'.format(name))
+    # the last matched group is in the matched alternative
+    for cls, start, end in NAMING_SPANS:
+        if match.lastindex < end:
+            break
+    try:
+        return cls._from_groups(match.groups()[start - 1:end - 1], name,
+                                path, lazy)
+    except ValueError as e:
+        return Rejection(fullname, cls, str(e))
+
+
+def classify_many(names, lazy=False):
+    '''
+    Classifies names (or paths)
+        yields Sample, Samplesheet or Rejection
+    '''
+    for name in names:
+        yield classify(name, lazy)
@@ -0,0 +1,94 @@
+'''
+External-memory sort and deduplication of sample name listings
+
+Streams a listing, sorts it by sample name (str(sample)) in sorted runs
+spilled to disk when the memory budget is exceeded, and k-way merges the
+runs into deduplicated groups of names per sample
+'''
+
+import io
+import sys
+import heapq
+import shutil
+import itertools
+import tempfile
+
+from .sample import Sample
+
+# default memory budget (bytes) for in-memory runs
+MEMORY_LIMIT = 256 * 1024 * 1024
+
+# approximate per-entry overhead of a buffered (key, name) tuple
+ENTRY_OVERHEAD = 150
+
+
+def _spill(entries, directory):
+    '''
+    Writes a sorted run to a temporary file
+    '''
+    entries.sort()
+    fd, path = tempfile.mkstemp(suffix='.run', dir=directory)
+    with io.open(fd, 'w', encoding='utf-8', newline='\n') as fh:
+        for key, name in entries:
+            fh.write(u'{}\t{}\n'.format(key, name))
+    del entries[:]
+    return path
+
+
+def _read_run(path):
+    '''
+    Yields (key, name) from a sorted run
+    '''
+    with io.open(path, encoding='utf-8', newline='\n') as fh:
+        for line in fh:
+            key, name = line.rstrip('\n').split('\t', 1)
+            yield key, name
+
+
+def sort_names(names, memory_limit=MEMORY_LIMIT, tmpdir=None, rejects=None):
+    '''
+    Sorts and deduplicates a stream of sample/file names by sample name
+    in bounded memory
+        yields (sample name, sorted list of unique names)
+    Names that fail validation are skipped and appended to rejects (list)
+    if provided
+    '''
+    directory = tempfile.mkdtemp(prefix='seglh_naming_', dir=tmpdir)
+    try:
+        runs = []
+        entries = []
+        size = 0
+        for name in names:
+            name = name.rstrip('\r\n')
+            if not name:
+                continue
+            try:
+                key = str(Sample.from_string(name))
+            except ValueError:
+                if rejects is not None:
+                    rejects.append(name)
+                continue
+            entries.append((key, name))
+            size += len(key) + len(name) + ENTRY_OVERHEAD
+            if size >= memory_limit:
+                runs.append(_spill(entries, directory))
+                size = 0
+        if runs:
+            if entries:
+                runs.append(_spill(entries, directory))
+            merged = heapq.merge(*[_read_run(path) for path in runs])
+        else:
+            entries.sort()
+            merged = iter(entries)
+        for key, group in itertools.groupby(merged, key=lambda x: x[0]):
+            unique = [name for name, _ in
+                      itertools.groupby(name for _, name in group)]
+            yield key, unique
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    # sorted, grouped and deduplicated listing from stdin
+    for key, group in sort_names(sys.stdin):
+        sys.stdout.write('{}\t{}\n'.format(key, '\t'.join(group)))
@@ -0,0 +1,96 @@
+'''
+Registry of known (genomics) file types matched on file name suffixes
+
+Registered extensions are kept in a suffix table (extension -> type), a
+file name is matched by looking up its dot-separated suffixes, longest
+first, so the cost is bounded by the longest registered extension.
+'''
+
+# compression extensions ('zx' kept for compatibility)
+COMPRESSIONS = ('gz', 'zip', 'bz2', 'xz', 'zx')
+
+# known extensions -> file type
+FILE_TYPES = {
+    'fastq': 'fastq',
+    'fastq.gz': 'fastq',
+    'fq': 'fastq',
+    'fq.gz': 'fastq',
+    'bam': 'bam',
+    'bai': 'bai',
+    'bam.bai': 'bai',
+    'cram': 'cram',
+    'crai': 'crai',
+    'cram.crai': 'crai',
+    'vcf': 'vcf',
+    'vcf.gz': 'vcf',
+    'tbi': 'tbi',
+    'vcf.gz.tbi': 'tbi',
+    'bed': 'bed',
+    'json': 'json',
+    'csv': 'csv',
+    'tsv': 'tsv',
+    'txt': 'txt',
+    'html': 'html',
+    'pdf': 'pdf',
+}
+
+
+class FileTypes(object):
+    """
+    Suffix table of file extensions and their file types
+    """
+    def __init__(self, types=FILE_TYPES, compressions=COMPRESSIONS):
+        self._types = {}
+        self._parts = 0  # dot-separated parts of the longest extension
+        self.compressions = frozenset(compressions)
+        for extension, file_type in types.items():
+            self.register(extension, file_type)
+
+    def register(self, extension, file_type):
+        '''
+        Adds or replaces an extension (e.g. 'g.vcf.gz')
+        Samples already parsed keep their cached type
+        '''
+        self._types[extension] = file_type
+        self._parts = max(self._parts, extension.count('.') + 1)
+
+    def file_type(self, name):
+        '''
+        File type of the longest registered extension of name (or None)
+        '''
+        parts = name.split('.')
+        for i in range(max(1, len(parts) - self._parts), len(parts)):
+            file_type = self._types.get('.'.join(parts[i:]))
+            if file_type is not None:
+                return file_type
+        return None
+
+    def parse(self, name):
+        '''
+        Splits the file extension of name
+            (extension, extension without compression, file type)
+        A compressed extension is the last two parts if the inner one
+        is 2 to 5 word characters long (e.g. vcf.gz)
+        '''
+        parts = name.split('.')
+        extension = parts[-1]
+        inner = parts[-2] if len(parts) > 1 else parts[0]
+        if extension in self.compressions and 2 <= len(inner) <= 5 and \
+                inner.replace('_', 'a').isalnum():
+            return inner + '.' + extension, inner, self.file_type(name)
+        return extension, extension, self.file_type(name)
+
+
+# default file type registry
+DEFAULT_FILE_TYPES = FileTypes()
+
+
+def group_by_type(samples):
+    '''
+    Groups parsed files (Sample) by file type in a single pass
+        file type -> list of Sample (None for unknown types)
+    '''
+    groups = {}
+    for sample in samples:
+        groups.setdefault(sample.file_type, []).append(sample)
+    return groups
@@ -0,0 +1,74 @@
+'''
+Groups companion files (read pairs, alignment indexes) by sample and lane
+'''
+
+# reads that must be present together
+READ_PAIRS = {
+    'R1': 'R2',
+    'R2': 'R1'
+}
+
+# file types that must be accompanied by an index file
+COMPANIONS = {
+    'bam': 'bai',
+    'cram': 'crai',
+    'vcf.gz': 'tbi'
+}
+
+
+def group_by_sample(samples):
+    '''
+    Groups parsed files (Sample) in a single pass
+        sample name -> samplesheetindex -> lane -> readnumber
+        -> file extension -> list of Sample
+    Samples not built from a file name are grouped under extension None
+    '''
+    groups = {}
+    for sample in samples:
+        extension = sample.file_extension() if sample.rest else None
+        groups.setdefault(str(sample), {}) \
+            .setdefault(sample.samplesheetindex, {}) \
+            .setdefault(sample.lane, {}) \
+            .setdefault(sample.readnumber, {}) \
+            .setdefault(extension, []).append(sample)
+    return groups
+
+
+def find_incomplete(groups):
+    '''
+    Finds read pairs with a missing mate (within a lane) and files
+    missing their index in groups from group_by_sample
+        list of (sample name, samplesheetindex, lane, readnumber,
+                 extension, missing readnumber or extension)
+    Indexes are matched per file (X.bam needs X.bam.bai or X.bai), the
+    extension of a file missing its index is its full suffix (e.g.
+    realigned.bam)
+    '''
+    incomplete = []
+    for name, indexes in groups.items():
+        for index, lanes in indexes.items():
+            for lane, reads in lanes.items():
+                for read, extensions in reads.items():
+                    mate = reads.get(READ_PAIRS.get(read), {})
+                    files = None
+                    for extension in extensions:
+                        if read in READ_PAIRS and extension not in mate:
+                            incomplete.append((name, index, lane, read,
+                                               extension, READ_PAIRS[read]))
+                        if extension not in COMPANIONS:
+                            continue
+                        if files is None:
+                            files = set(
+                                (sample.stable, sample.rest)
+                                for samples in extensions.values()
+                                for sample in samples)
+                        companion = COMPANIONS[extension]
+                        for sample in extensions[extension]:
+                            expected = (
+                                sample.rest + '.' + companion,
+                                sample.rest[:-len(extension)] + companion)
+                            if not any((sample.stable, rest) in files
+                                       for rest in expected):
+                                incomplete.append((name, index, lane, read,
+                                                   sample.rest[1:], companion))
+    return incomplete
@@ -0,0 +1,111 @@
+'''
+Detects conflicting patient identifiers across runs
+
+The same DNA number (id1) must always come with the same secondary
+identifier, initials and sex; a conflict indicates a possible sample
+swap. Samples are checked in a single streaming pass against compact
+per-id1 state (first seen value and source of each identifier), which
+can be saved and loaded to check new runs incrementally.
+'''
+
+import io
+import os
+import json
+from collections import namedtuple
+
+# identifiers which must be consistent for a DNA number
+IDENTITY_FIELDS = ('id2', 'initials', 'sex')
+
+# DNA numbers shared by control samples (NTC, NA, HD) with different id2
+CONTROL_IDS = frozenset(['000000'])
+
+# identifier differing from the value first seen for the DNA number
+Conflict = namedtuple('Conflict', ['id1', 'field', 'value', 'source',
+                                   'known', 'known_source'])
+
+# version of the saved state
+STATE_VERSION = 2
+
+
+class IdentityChecker(object):
+    """
+    Per-id1 identifiers, checked against each new sample
+        id1 -> [id2, initials, sex, source of id2, initials, sex]
+    """
+    def __init__(self, controls=CONTROL_IDS):
+        self._identities = {}
+        self.controls = frozenset(controls)
+
+    def __len__(self):
+        return len(self._identities)
+
+    def check(self, sample, source=None, reported=None):
+        '''
+        Checks a sample and adds its identifiers
+        Missing identifiers and control DNA numbers do not conflict
+            list of Conflict
+        source: origin of the sample (default: full name)
+        reported: set of (id1, field, value) not to report again (updated)
+        '''
+        if sample.id1 in self.controls:
+            return []
+        if source is None:
+            source = repr(sample)
+        known = self._identities.get(sample.id1)
+        if known is None:
+            known = self._identities[sample.id1] = [None] * 6
+        conflicts = []
+        for i, field in enumerate(IDENTITY_FIELDS):
+            value = getattr(sample, field)
+            if value is None:
+                continue
+            if known[i] is None:
+                known[i] = value
+                known[i + 3] = source
+            elif known[i] != value:
+                if reported is not None:
+                    if (sample.id1, field, value) in reported:
+                        continue
+                    reported.add((sample.id1, field, value))
+                conflicts.append(Conflict(sample.id1, field, value, source,
+                                          known[i], known[i + 3]))
+        return conflicts
+
+    def update(self, samples):
+        '''
+        Checks samples (e.g. of a new run) in a single pass
+        Each conflicting value is reported once per call (e.g. not for
+        every read of the same sample)
+            yields Conflict
+        '''
+        reported = set()
+        for sample in samples:
+            for conflict in self.check(sample, reported=reported):
+                yield conflict
+
+    def save(self, path):
+        '''
+        Writes the state to a JSON file (replaced atomically)
+        '''
+        state = {
+            'version': STATE_VERSION,
+            'identities': self._identities,
+        }
+        temporary = path + '.tmp'
+        with io.open(temporary, 'w', encoding='utf-8') as fh:
+            json.dump(state, fh, separators=(',', ':'))
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path, controls=CONTROL_IDS):
+        '''
+        Restores the state from a JSON file written by save
+        '''
+        with io.open(path, encoding='utf-8') as fh:
+            state = json.load(fh)
+        if state.get('version') != STATE_VERSION:
+            raise ValueError("Unsupported identity state version ({})"
+                             .format(state.get('version')))
+        checker = cls(controls)
+        checker._identities = state['identities']
+        return checker
@@ -0,0 +1,190 @@
+'''
+Multi-key in-memory index of samples with on-disk (SQLite) persistence
+
+The indexed constituents are saved as indexed columns next to the names,
+so loading fills the posting sets from the columns and names are only
+parsed when they are returned by a query.
+'''
+
+import sqlite3
+
+from .sample import Sample
+from .samplesheet import Samplesheet
+
+# indexed sample name constituents
+SAMPLE_KEYS = ('id1', 'id2', 'panelnumber', 'libraryprep', 'ods')
+
+# indexed samplesheet name constituents (run of the sample)
+SAMPLESHEET_KEYS = ('date', 'flowcellid')
+
+# saved columns (names and indexed constituents)
+COLUMNS = ('sample', 'samplesheet') + SAMPLE_KEYS + SAMPLESHEET_KEYS
+
+
+class SampleIndex(object):
+    """
+    Indexes samples and the samplesheet of their run on secondary keys
+    Queries intersect the matching keys starting from the smallest set
+    Names loaded from a database are parsed on first access
+    """
+    def __init__(self, items=()):
+        '''
+        Builds index from (sample, samplesheet) pairs
+        '''
+        self._samples = []  # Sample or unparsed name
+        self._samplesheets = []  # Samplesheet, unparsed name or None
+        self._parsed = {}  # unparsed samplesheet name -> Samplesheet
+        self._indexes = dict(
+            (key, {}) for key in SAMPLE_KEYS + SAMPLESHEET_KEYS)
+        for sample, samplesheet in items:
+            self.add(sample, samplesheet)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def __iter__(self):
+        '''
+        Yields all indexed (sample, samplesheet) pairs
+        '''
+        for position in range(len(self._samples)):
+            yield self._sample(position), self._samplesheet(position)
+
+    def _sample(self, position):
+        sample = self._samples[position]
+        if isinstance(sample, str):
+            sample = self._samples[position] = Sample.from_string(sample)
+        return sample
+
+    def _samplesheet(self, position):
+        samplesheet = self._samplesheets[position]
+        if isinstance(samplesheet, str):
+            # samples of a run share the samplesheet
+            if samplesheet not in self._parsed:
+                self._parsed[samplesheet] = \
+                    Samplesheet.from_string(samplesheet)
+            samplesheet = self._samplesheets[position] = \
+                self._parsed[samplesheet]
+        return samplesheet
+
+    def add(self, sample, samplesheet=None):
+        '''
+        Adds sample (and the samplesheet of the run) to the index
+        '''
+        position = len(self._samples)
+        self._samples.append(sample)
+        self._samplesheets.append(samplesheet)
+        for keys, item in ((SAMPLE_KEYS, sample),
+                           (SAMPLESHEET_KEYS, samplesheet)):
+            if item is None:
+                continue
+            for key in keys:
+                value = getattr(item, key)
+                if value is not None:
+                    self._indexes[key].setdefault(value, set()).add(position)
+
+    def query(self, since=None, until=None, **criteria):
+        '''
+        Returns samples matching all criteria (in order of insertion)
+            key=value: exact match on an indexed key
+            key=callable: predicate on sample or samplesheet constituent
+            since/until: samplesheet date range (YYMMDD, inclusive),
+                         years are compared as 2000-2099 (e.g. '991231'
+                         is after '220101')
+        '''
+        exact = []
+        predicates = []
+        for key, value in criteria.items():
+            if callable(value):
+                predicates.append((key, value))
+            elif key in self._indexes:
+                exact.append(self._indexes[key].get(value, set()))
+            else:
+                raise ValueError("Unknown index key ({})".format(key))
+        if since is not None or until is not None:
+            exact.append(set().union(*[
+                positions for date, positions in self._indexes['date'].items()
+                if (since is None or date >= since) and
+                (until is None or date <= until)
+            ]))
+        if exact:
+            exact.sort(key=len)
+            positions = exact[0].intersection(*exact[1:])
+        else:
+            positions = range(len(self._samples))
+        results = []
+        for position in sorted(positions):
+            sample = self._sample(position)
+            samplesheet = self._samplesheet(position)
+            if all(predicate(self._value(sample, samplesheet, key))
+                   for key, predicate in predicates):
+                results.append(sample)
+        return results
+
+    @staticmethod
+    def _value(sample, samplesheet, key):
+        if hasattr(Sample, key):
+            return getattr(sample, key)
+        if hasattr(Samplesheet, key):
+            return getattr(samplesheet, key, None)
+        raise ValueError("Unknown constituent ({})".format(key))
+
+    def save(self, path):
+        '''
+        Writes the indexed names and constituents to an SQLite database
+        (one indexed column per key, also for querying it directly)
+        '''
+        connection = sqlite3.connect(path)
+        try:
+            with connection:
+                connection.execute('DROP TABLE IF EXISTS samples')
+                connection.execute('CREATE TABLE samples ({})'.format(
+                    ', '.join(column + ' TEXT' for column in COLUMNS)))
+                for key in SAMPLE_KEYS + SAMPLESHEET_KEYS:
+                    connection.execute(
+                        'CREATE INDEX samples_{0} ON samples ({0})'
+                        .format(key))
+                connection.executemany(
+                    'INSERT INTO samples VALUES ({})'.format(
+                        ', '.join('?' * len(COLUMNS))),
+                    self._rows())
+        finally:
+            connection.close()
+
+    def _rows(self):
+        # constituents from the posting sets (loaded names stay unparsed)
+        keys = SAMPLE_KEYS + SAMPLESHEET_KEYS
+        columns = [[None] * len(self._samples) for key in keys]
+        for column, key in zip(columns, keys):
+            for value, positions in self._indexes[key].items():
+                for position in positions:
+                    column[position] = value
+        for position, names in enumerate(
+                zip(self._samples, self._samplesheets)):
+            row = [name if name is None or isinstance(name, str)
+                   else repr(name) for name in names]
+            row.extend(column[position] for column in columns)
+            yield row
+
+    @classmethod
+    def load(cls, path):
+        '''
+        Rebuilds the index from an SQLite database written by save
+        The posting sets are filled from the saved columns, names are
+        parsed on first access
+        '''
+        connection = sqlite3.connect(path)
+        index = cls()
+        keys = SAMPLE_KEYS + SAMPLESHEET_KEYS
+        try:
+            for position, row in enumerate(connection.execute(
+                    'SELECT {} FROM samples ORDER BY rowid'.format(
+                        ', '.join(COLUMNS)))):
+                index._samples.append(row[0])
+                index._samplesheets.append(row[1])
+                for key, value in zip(keys, row[2:]):
+                    if value is not None:
+                        index._indexes[key].setdefault(value, set()) \
+                            .add(position)
+        finally:
+            connection.close()
+        return index
@@ -0,0 +1,82 @@
+'''
+Reconciles samplesheet contents with demultiplexed output files
+'''
+
+import collections
+
+# reads expected for every sample after demultiplexing
+READS = ('R1', 'R2')
+
+# demultiplexed file type
+EXTENSION = 'fastq.gz'
+
+Reconciliation = collections.namedtuple(
+    'Reconciliation', ['missing', 'extra', 'mismatched'])
+
+
+def samplesheet_indexes(samples):
+    '''
+    Samplesheet index of each sample name in the order of first occurrence
+    in the samplesheet (as assigned by bcl2fastq/BCL Convert)
+        OrderedDict (sample name -> samplesheet index)
+    '''
+    indexes = collections.OrderedDict()
+    for sample in samples:
+        name = str(sample)
+        if name not in indexes:
+            indexes[name] = 'S{}'.format(len(indexes) + 1)
+    return indexes
+
+
+def reconcile(samples, files, reads=READS, extension=EXTENSION):
+    '''
+    Joins the samplesheet samples (e.g. from Samplesheet.read_samples)
+    against the parsed output files (Sample) of the same run.
+    Files with other extensions are ignored (all files if None).
+    Lane-split files are expected on the lanes of each sample in the
+    samplesheet (Lane column), on all lanes of the run's files if the
+    samplesheet has no Lane column. If the run's files are not split by
+    lane, the Lane column is ignored.
+    Returns Reconciliation of
+        missing: (sample name, samplesheetindex, lane, readnumber) without
+                 file (lane is None if files are not lane-split)
+        extra: files of samples not in the samplesheet, unexpected reads
+               or lanes
+        mismatched: files of samplesheet samples with wrong samplesheetindex
+    '''
+    indexes = samplesheet_indexes(samples)
+    suffix = '.' + extension if extension else ''
+    files = [sample for sample in files if sample.rest.endswith(suffix)]
+    run_lanes = sorted(set(sample.lane for sample in files),
+                       key=lambda lane: lane or '') or [None]
+    lanes = collections.OrderedDict()
+    for sample in samples:
+        expected = lanes.setdefault(str(sample), [])
+        if sample.lane and run_lanes != [None]:
+            sample_lanes = [sample.lane]
+        else:
+            sample_lanes = run_lanes
+        for lane in sample_lanes:
+            if lane not in expected:
+                expected.append(lane)
+    found = set()
+    extra = []
+    mismatched = []
+    for sample in files:
+        name = str(sample)
+        index = indexes.get(name)
+        if index is None or sample.readnumber not in reads or \
+                sample.lane not in lanes[name]:
+            extra.append(sample)
+        elif sample.samplesheetindex != index:
+            mismatched.append(sample)
+        else:
+            found.add((name, index, sample.lane, sample.readnumber))
+    missing = [
+        (name, index, lane, read)
+        for name, index in indexes.items()
+        for lane in lanes[name]
+        for read in reads
+        if (name, index, lane, read) not in found
+    ]
+    return Reconciliation(missing, extra, mismatched)
@@ -0,0 +1,152 @@
+'''
+Reference registries of known constituent values
+
+Valid ODS codes, active Pan numbers (with their panel name) and known
+library preparation prefixes are loaded from local CSV or JSON files into
+frozen sets and dicts (constant time membership). Registry files are
+reloaded when modified, so long-running services pick up changes without
+restarting. Registries compile a strict sample class which checks the
+constituents against them on parsing.
+'''
+
+import io
+import os
+import csv
+import json
+import time
+
+from .scheme import depends_on, build_class
+from .sample import Sample, LIBRARYPREP_REGEX
+
+# seconds between checks for modified registry files
+RELOAD_INTERVAL = 5.0
+
+
+def load_registry(path):
+    '''
+    Reads a registry file
+        CSV: header row, key and optional value columns
+        JSON: list of keys or object of key -> value
+    Returns dict of key -> value (None if no value)
+    '''
+    with io.open(path, encoding='utf-8', newline='') as fh:
+        if path.endswith('.json'):
+            data = json.load(fh)
+            if isinstance(data, dict):
+                return dict(data)
+            return dict.fromkeys(data)
+        rows = csv.reader(fh)
+        next(rows, None)
+        return dict((row[0].strip(), row[1].strip() if len(row) > 1 else None)
+                    for row in rows if row and row[0].strip())
+
+
+class Registry(object):
+    """
+    Known values of a constituent, reloaded when the file is modified
+    """
+    def __init__(self, path, interval=RELOAD_INTERVAL):
+        '''
+        path: CSV or JSON file (see load_registry)
+        interval: seconds between checks for modifications
+        '''
+        self.path = path
+        self.interval = interval
+        self._mtime = None
+        self._checked = time.monotonic()
+        self._keys = frozenset()
+        self._values = {}
+        self.reload()
+
+    def reload(self):
+        '''
+        Loads the file if modified since it was last loaded
+        Returns True if reloaded
+        '''
+        mtime = os.stat(self.path).st_mtime
+        if mtime == self._mtime:
+            return False
+        values = load_registry(self.path)
+        # swapped at once, readers see either the old or the new tables
+        self._keys, self._values = frozenset(values), values
+        self._mtime = mtime
+        return True
+
+    def _refresh(self):
+        now = time.monotonic()
+        if now - self._checked < self.interval:
+            return
+        self._checked = now
+        try:
+            self.reload()
+        except (OSError, ValueError):
+            # keep serving the loaded values (e.g. file being replaced)
+            pass
+
+    def __contains__(self, key):
+        self._refresh()
+        return key in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def get(self, key, default=None):
+        '''
+        Value of a known key (e.g. panel name of a Pan number)
+        '''
+        self._refresh()
+        return self._values.get(key, default)
+
+
+class Registries(object):
+    """
+    Strict checks of sample constituents against reference registries
+    (each registry is optional)
+    """
+    def __init__(self, ods=None, panels=None, libraryprep=None,
+                 interval=RELOAD_INTERVAL):
+        '''
+        ods: file of valid ODS codes
+        panels: file of active Pan numbers and their panel names
+        libraryprep: file of known library preparation prefixes
+        '''
+        self.ods, self.panels, self.libraryprep = [
+            Registry(path, interval) if path else None
+            for path in (ods, panels, libraryprep)
+        ]
+
+    @depends_on('libraryprep', 'panelname', 'panelnumber', 'ods')
+    def check(self, sample):
+        '''
+        Checks the sample constituents are known
+        (a sample requirement, aggregates errors for different fields)
+        '''
+        collected_errors = []
+        if self.libraryprep is not None:
+            prefix = LIBRARYPREP_REGEX.match(sample.libraryprep).group(1)
+            if prefix not in self.libraryprep:
+                collected_errors.append(
+                    "Unknown LibraryPrep prefix ({})".format(prefix))
+        if self.panels is not None:
+            if sample.panelnumber not in self.panels:
+                collected_errors.append(
+                    "Unknown Pan Number ({})".format(sample.panelnumber))
+            elif sample.panelname and \
+                    self.panels.get(sample.panelnumber) not in \
+                    (None, sample.panelname):
+                collected_errors.append(
+                    "Panel Name does not match Pan Number ({})"
+                    .format(sample.panelname))
+        if self.ods is not None and sample.ods and sample.ods not in self.ods:
+            collected_errors.append(
+                "Unknown or invalid ODS code ({})".format(sample.ods))
+        if collected_errors:
+            raise ValueError(", ".join(collected_errors))
+
+    def strict(self, base=Sample, name='StrictSample'):
+        '''
+        Builds a sample class checking constituents against the registries
+        '''
+        scheme = base._scheme
+        return build_class(name, scheme.replace(
+            requirements=scheme.requirements + [self.check]), base)
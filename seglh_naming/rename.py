@@ -0,0 +1,201 @@
+'''
+Plans and applies bulk renames of sample files after constituent changes
+
+The plan is computed in memory from a single directory listing: target
+collisions and rename cycles are detected up front, renames are ordered
+so that no target is occupied when it is renamed into and cycles are
+broken with temporary names. Renames are executed in batches, each
+batch is written to a journal before it is executed so that an
+interrupted run can be rolled back.
+'''
+
+import os
+
+from .sample import Sample
+
+# renames journaled (and synced) at once
+BATCH_SIZE = 1000
+
+# temporary name of files moved out of a rename cycle
+TEMPORARY_NAME = '.{}.renaming'
+
+
+class RenamePlan(object):
+    """
+    Renames (source, target) within a directory
+    """
+    def __init__(self, directory, renames, existing=(), errors=()):
+        '''
+        directory: renamed directory
+        renames: list of (source, target) file names
+        existing: file names in the directory
+        errors: list of (file name, validation error)
+        '''
+        self.directory = directory
+        self.renames = list(renames)
+        self.errors = list(errors)
+        self._existing = set(existing)
+        self.collisions = self._find_collisions()
+        self.cycles = self._find_cycles()
+
+    def __len__(self):
+        return len(self.renames)
+
+    @property
+    def is_valid(self):
+        '''
+        True if plan can be applied (no collisions or invalid names)
+        '''
+        return not (self.collisions or self.errors)
+
+    def _find_collisions(self):
+        '''
+        Targets of several renames and existing files (not renamed) that
+        would be overwritten
+            list of (target, [sources])
+        '''
+        sources = set(source for source, _ in self.renames)
+        targets = {}
+        for source, target in self.renames:
+            targets.setdefault(target, []).append(source)
+        return [
+            (target, found) for target, found in targets.items()
+            if len(found) > 1 or
+            (target in self._existing and target not in sources)
+        ]
+
+    def _find_cycles(self):
+        '''
+        Renames whose targets are sources of each other in a closed loop
+            list of [source, ...]
+        '''
+        pending = dict(self.renames)
+        visited = set()
+        cycles = []
+        for start in pending:
+            path = []
+            index = {}
+            name = start
+            while name in pending and name not in visited:
+                visited.add(name)
+                index[name] = len(path)
+                path.append(name)
+                name = pending[name]
+            if name in index:
+                cycles.append(path[index[name]:])
+        return cycles
+
+    def _temporary(self, name, taken):
+        temporary = TEMPORARY_NAME.format(name)
+        while temporary in self._existing or temporary in taken:
+            temporary = TEMPORARY_NAME.format(temporary)
+        taken.add(temporary)
+        return temporary
+
+    def steps(self):
+        '''
+        Ordered renames (source, target), each target is free when
+        renamed into. Cycles are broken with a temporary name
+        '''
+        pending = dict(self.renames)
+        steps = []
+        taken = set()
+        for cycle in self.cycles:
+            temporary = self._temporary(cycle[0], taken)
+            steps.append((cycle[0], temporary))
+            pending[temporary] = pending.pop(cycle[0])
+        scheduled = set()
+        for start in list(pending):
+            chain = []
+            name = start
+            while name in pending and name not in scheduled:
+                chain.append(name)
+                scheduled.add(name)
+                name = pending[name]
+            steps.extend((source, pending[source]) for source in reversed(chain))
+        return steps
+
+    def dry_run(self):
+        '''
+        Describes the renames without executing them
+            list of lines
+        '''
+        lines = ['{} -> {}'.format(source, target)
+                 for source, target in self.steps()]
+        lines.extend('COLLISION {} <- {}'.format(target, ', '.join(sources))
+                     for target, sources in self.collisions)
+        lines.extend('INVALID {} ({})'.format(name, error)
+                     for name, error in self.errors)
+        return lines
+
+    def apply(self, journal, batch_size=BATCH_SIZE):
+        '''
+        Executes the renames in batches, journaled to file before execution
+        Completed renames are rolled back if a rename fails. The journal is
+        removed on success
+        '''
+        if not self.is_valid:
+            raise ValueError("Rename plan invalid ({} collisions, {} errors)"
+                             .format(len(self.collisions), len(self.errors)))
+        steps = [(os.path.join(self.directory, source),
+                  os.path.join(self.directory, target))
+                 for source, target in self.steps()]
+        done = []
+        with open(journal, 'w') as fh:
+            try:
+                for start in range(0, len(steps), batch_size):
+                    batch = steps[start:start + batch_size]
+                    fh.writelines('{}\t{}\n'.format(*step) for step in batch)
+                    fh.flush()
+                    os.fsync(fh.fileno())
+                    for source, target in batch:
+                        os.rename(source, target)
+                        done.append((source, target))
+            except Exception:
+                for source, target in reversed(done):
+                    os.rename(target, source)
+                raise
+        os.remove(journal)
+        return len(done)
+
+
+def plan_renames(directory, **changes):
+    '''
+    Plans renaming all sample files in directory with changed constituents
+    Files not named after the sample naming scheme are left alone
+    '''
+    existing = []
+    renames = []
+    errors = []
+    for entry in sorted(os.scandir(directory), key=lambda x: x.name):
+        if not entry.is_file():
+            continue
+        existing.append(entry.name)
+        try:
+            sample = Sample.from_string(entry.name)
+        except ValueError:
+            continue
+        try:
+            target = os.path.basename(repr(sample.replace(**changes)))
+        except ValueError as e:
+            errors.append((entry.name, str(e)))
+            continue
+        if target != entry.name:
+            renames.append((entry.name, target))
+    return RenamePlan(directory, renames, existing, errors)
+
+
+def rollback(journal):
+    '''
+    Reverts the renames of an interrupted run from its journal
+    Returns the number of reverted renames
+    '''
+    with open(journal) as fh:
+        steps = [line.rstrip('\n').split('\t') for line in fh if line.strip()]
+    reverted = 0
+    for source, target in reversed(steps):
+        if os.path.exists(target) and not os.path.exists(source):
+            os.rename(target, source)
+            reverted += 1
+    os.remove(journal)
+    return reverted
@@ -2,13 +2,11 @@
 Builds, reads and validates SEGLH sample/analysis naming conventions
 '''
 
-import os
 import sys
 import re
-import hashlib
 
-# salt used to generate anonymised function'
-SALT = 'jdhFeducf2gkFb2jj7hjs345klosboiydbo73u7g390yubfkd'
+from .scheme import Field, Scheme, Naming, compile_scheme, depends_on, SALT  # noqa: F401
+from .filetype import DEFAULT_FILE_TYPES
 
 # sample_name regular expression
 SAMPLE_REGEX = (
@@ -18,208 +16,47 @@ SAMPLE_REGEX = (
     r'(?:_([^_]+))?'  # Human readable panel name
     r'_(Pan[^_\.]*)'  # pan number
     r'(?:_(R[A-Z0-9]{2}))?'  # ODS code
-    r'(?:_(S\d+)_(R\d))?'  # samplesheet number and read number
+    r'(?:_(S\d+)(?:_(L\d{3}))?_([RI]\d))?'  # samplesheet number, lane and read/index number
     r'(?:_([0-9]{3}))?'  # demultiplex stable number
     r'(.*)$'  # can be followed by more (eg from a filename)
 )
 
-# sample name constituent field order
-SAMPLE_FIELDS = [
-    'libraryprep',
-    'samplecount',
-    'id1',
-    'id2',
-    'initials',
-    'sex',
-    'panelname',
-    'panelnumber',
-    'ods',
-    'samplesheetindex',
-    'readnumber',
-    'stable',
-    'rest'
-]
-
-
-class Sample(object):
-    """
-    Builds, reads and validates SEGLH sample naming conventions.
-    """
-    def __init__(self, **kwargs):
-        '''
-        Parses the sample name (or file name)
-        Calls the builder which validates each element
-        '''
-        self._path = kwargs.get('path')
-        self._name = kwargs.get('name')
-        self._build_name(kwargs)
-        self._is_modified = False
-        # validate completeness (at least one secondary identifier)
-        self._check_requirements()
-
-    def __setattr__(self, key, value):
-        if key != '_is_modified':
-            self._is_modified = True
-        super(Sample, self).__setattr__(key, value)
-
-    @classmethod
-    def from_string(cls, fullname):
-        """
-        Get sample name constituents from string input
-        """
-        assert isinstance(fullname, str)
-        dirs = fullname.split('/')
-        name = dirs[-1]
-        path = '/'.join(dirs[:-1])
-        match = re.match(SAMPLE_REGEX, name)
-        try:
-            assert match
-        except AssertionError:
-            raise ValueError('Wrong naming format ({})'.format(name))
-        else:
-            constituents = dict(zip(SAMPLE_FIELDS, match.groups()))
-            constituents['name'] = name
-            constituents['path'] = path
-            return cls(**constituents)
-
-    @classmethod
-    def from_dict(cls, constituents):
-        """
-        Get sample name constituents from dictionary input
-        """
-        assert isinstance(constituents, dict)
-        if constituents.get('path') is None:
-            constituents['path'] = ''
-        return cls(**constituents)
-
-    def _build_name(self, constituents):
-        '''
-        build sample name string
-        validate construct and each constituent element
-        aggregates errors for different fields
-        '''
-        collected_errors = []
-        for field in SAMPLE_FIELDS:
-            try:
-                if field in constituents.keys() and \
-                        constituents[field] is not None:
-                    setattr(self, field, str(constituents[field]))
-                else:
-                    setattr(self, field, None)
-            except Exception as e:
-                collected_errors.append(str(e))
-        if collected_errors:
-            raise ValueError(", ".join(collected_errors))
-
-    def _check_requirements(self):
-        '''
-        Checks if sample name contains at least 2 patient identifiers
-        Checks total identifier length of TSO samples to be below 40 characters
-        '''
-        # min 2 identifiers
-        enough_identifiers = self.id1 and \
-            (self.id2 or (self.initials and self.sex))
-        if not enough_identifiers:
-            raise ValueError('Not enough identifiers in sample name ({})'.format(self._name))
-        # TSO max 40 characters
-        acceptable_length = not self.libraryprep.startswith('TSO') or \
-            len(str(self)) <= 40
-        if not acceptable_length:
-            raise ValueError('TSO sample name too long ({})'.format(self._name))
-
-    def __str__(self):
-        '''
-        Returns the sample name excluding any demultiplex additions
-        '''
-        return "_".join(filter(lambda x: x, [
-            self.libraryprep,
-            self.samplecount,
-            self.id1,
-            self.id2,
-            self.initials,
-            self.sex,
-            self.panelname,
-            self.panelnumber,
-            self.ods
-        ]))
-
-    def __repr__(self):
-        '''
-        Returns the full parsed string
-        '''
-        filename = "_".join(filter(lambda x: x, [
-            self.libraryprep,
-            self.samplecount,
-            self.id1,
-            self.id2,
-            self.initials,
-            self.sex,
-            self.panelname,
-            self.panelnumber,
-            self.ods,
-            self.samplesheetindex,
-            self.readnumber,
-            self.stable
-        ])) + self.rest
-        return os.path.join(self.path, filename)
-
-    def file_extension(self, include_compression=True):
-        '''
-        Extracts the file extension if any
-        '''
-        if not self.rest:
-            raise ValueError("Not a file name ({})".format(self.name))
-        constituents = self.rest.split('.')
-        # check if compressed
-        if constituents[-1] in ('gz', 'zip', 'bz2', 'zx') and \
-                constituents[-2] and \
-                re.match(r'\w{2,5}$', constituents[-2]):
-            if include_compression:
-                return '.'.join(constituents[-2:])
-            else:
-                return constituents[-2]
-        return constituents[-1]
-
-    def hash(self):
-        '''
-        A stable cryptographic hash to obfuscate sample name if required
-        '''
-        s = str(self) + SALT
-        s_encoded = s.encode('utf-8')
-        h = hashlib.new('sha256')
-        h.update(s_encoded)
-        return h.hexdigest()
-
-    # check if any elment has been modified
-    @property
-    def is_modified(self):
-        '''
-        returns True if any constituent part of the sample name
-        has been modified after the initial parsing
-        '''
-        return self._is_modified
-
-    # check if is a  file name
-    @property
-    def is_file(self):
-        '''
-        indicate if was built from file/path (inferred)
-            bool
-        '''
-        return bool(self.rest) or bool(self.path)
-
-    @property
-    def path(self):
-        '''
-        File path (if initialised from string)
-            string
-        '''
-        return self._path
-
-    # value properties
-    @property
-    def libraryprep(self):
-        '''
+# sample name excluding any demultiplex additions
+SHORT_FIELDS = ['libraryprep', 'samplecount', 'id1', 'id2', 'initials', 'sex',
+                'panelname', 'panelnumber', 'ods']
+
+# natural ordering of library preparation names (prefix, number, suffix)
+LIBRARYPREP_REGEX = re.compile(r'([A-Z]+)(\d+)(.*)$')
+
+
+@depends_on('id1', 'id2', 'initials', 'sex')
+def check_identifiers(sample):
+    '''
+    Checks if sample name contains at least 2 patient identifiers
+    '''
+    enough_identifiers = sample.id1 and \
+        (sample.id2 or (sample.initials and sample.sex))
+    if not enough_identifiers:
+        raise ValueError('Not enough identifiers in sample name ({})'.format(sample._name))
+
+
+@depends_on(*SHORT_FIELDS)
+def check_tso_length(sample):
+    '''
+    Checks total identifier length of TSO samples to be below 40 characters
+    '''
+    acceptable_length = not sample.libraryprep.startswith('TSO') or \
+        len(str(sample)) <= 40
+    if not acceptable_length:
+        raise ValueError('TSO sample name too long ({})'.format(sample._name))
+
+
+# sample naming scheme (constituents in field order)
+SAMPLE_SCHEME = Scheme(
+    regex=SAMPLE_REGEX,
+    fields=[
+        Field('libraryprep', r'^[A-Z]{3,}\d+[a-zA-Z0-9]*$',
+              "LibraryPrep name invalid ({})", doc='''
         Library preparation name
         Prefix:
             Three+ letter code
@@ -227,183 +64,154 @@ class Sample(object):
             number
         Postfix (optional):
             letters (eg. rep, b)
-        '''
-        return self._libraryprep
-
-    @libraryprep.setter
-    def libraryprep(self, value):
-        if not re.match(r'^[A-Z]{3,}\d+[a-zA-Z0-9]*$', value):
-            raise ValueError("LibraryPrep name invalid ({})".format(value))
-        self._libraryprep = value
-
-    @property
-    def samplecount(self):
-        '''
+        '''),
+        Field('samplecount', r'^\d{2,3}$',
+              "SampleCount invalid ({})", doc='''
         Sample index in library preparation:
             couple of ints (two digit number)
-        '''
-        return self._samplecount
-
-    @samplecount.setter
-    def samplecount(self, value):
-        if not re.match(r'^\d{2,3}$', value):
-            raise ValueError("SampleCount invalid ({})".format(value))
-        self._samplecount = value
-
-    @property
-    def id1(self):
-        '''
+        '''),
+        Field('id1', r'^\d{4,6}',
+              "Specimen/DNA number invalid ({})", doc='''
         Specimen or DNA number:
             Alpha numeric string
-        '''
-        return self._id1
-
-    @id1.setter
-    def id1(self, value):
-        if not re.match(r'^\d{4,6}', value):
-            raise ValueError("Specimen/DNA number invalid ({})".format(value))
-        self._id1 = value
-
-    @property
-    def id2(self):
-        '''
+        '''),
+        Field('id2', r'^(:?HD|NA|NT?C|SC|\d)[a-zA-Z0-9]{3,}$',
+              "Secondary identifier invalid ({})", optional=True, doc='''
         Secondary Patient, Specimen or DNA identifier:
             Alpha numeric string
-        '''
-        return self._id2
-
-    @id2.setter
-    def id2(self, value):
-        if value and not re.match(r'^(:?HD|NA|NT?C|SC|\d)[a-zA-Z0-9]{3,}$', value):
-            raise ValueError("Secondary identifier invalid ({})".format(value))
-        self._id2 = value
-
-    @property
-    def initials(self):
-        '''
+        '''),
+        Field('initials', r'^[A-Z]{2}$',
+              "Initials invalid ({})", optional=True, doc='''
         Patient initials:
             couple of chars
-        '''
-        return self._initials
-
-    @initials.setter
-    def initials(self, value):
-        if value and not re.match(r'^[A-Z]{2}$', value):
-            raise ValueError("Initials invalid ({})".format(value))
-        self._initials = value
-
-    @property
-    def sex(self):
-        '''
+        '''),
+        Field('sex', r'^[MFU]$',
+              "Sex invalid ({})", optional=True, doc='''
         Patient sex:
             single char
-        '''
-        return self._sex
-
-    @sex.setter
-    def sex(self, value):
-        if value and not re.match(r'^[MFU]$', value):
-            raise ValueError("Sex invalid ({})".format(value))
-        self._sex = value
-
-    @property
-    def panelname(self):
-        '''
+        '''),
+        Field('panelname', r'^[a-zA-Z0-9]{3,}$',
+              "Panel Name invalid ({})", optional=True, doc='''
         Human readable panel name
             string
-        '''
-        return self._panelname
-
-    @panelname.setter
-    def panelname(self, value):
-        if value and not re.match(r'^[a-zA-Z0-9]{3,}$', value):
-            raise ValueError("Panel Name invalid ({})".format(value))
-        self._panelname = value
-
-    @property
-    def panelnumber(self):
-        '''
+        '''),
+        Field('panelnumber', r'^Pan\d{2,}$',
+              "Pan Number invalid ({})", doc='''
         Panel/routing number
             digits prefixed by Pan
-        '''
-        return self._panelnumber
-
-    @panelnumber.setter
-    def panelnumber(self, value):
-        if not re.match(r'^Pan\d{2,}$', value):
-            raise ValueError("Pan Number invalid ({})".format(value))
-        self._panelnumber = value
-
-    @property
-    def ods(self):
-        '''
+        '''),
+        Field('ods', r'^R[A-Z0-9]{2}$',
+              "Unknown or invalid ODS code ({})", optional=True, doc='''
         ODS code:
             Triplet of alphanumeric character
-        '''
-        return self._ods
+        '''),
+        Field('samplesheetindex', r'^S\d+$',
+              "Samplesheet index invalid ({})", optional=True, doc='''
+        Samplesheet index (from dmx):
+            digits prefixed with S
+        '''),
+        Field('lane', r'^L\d{3}$',
+              "Lane invalid ({})", optional=True, doc='''
+        Sequencing lane (from dmx without --no-lane-splitting)
+            three digits prefixed by L
+        '''),
+        Field('readnumber', r'^[RI]\d$',
+              "Readnumber invalid ({})", optional=True, doc='''
+        Read number in pair
+            single digit prefixed by R or I
+        '''),
+        Field('stable', r'^001$',
+              "Number invalid ({})", optional=True, doc='''
+        Stable number from demultiplexing
+            001
+        '''),
+        Field('rest', r'^[\w\.]*$',
+              "Unrecognised characters in parsed name ({})", optional=True,
+              default='', doc='''
+        Remainder of the parsed string (e.g. rest of filename)
+            a string of any length
+        '''),
+    ],
+    short=SHORT_FIELDS,
+    # full parsed string
+    full=SHORT_FIELDS + ['samplesheetindex', 'lane', 'readnumber', 'stable',
+                         'rest'],
+    suffix='rest',
+    requirements=[check_identifiers, check_tso_length]
+)
 
-    @ods.setter
-    def ods(self, value):
-        if value and not re.match(r'^R[A-Z0-9]{2}$', value):
-            raise ValueError("Unknown or invalid ODS code ({})".format(value))
-        self._ods = value
+# sample name constituent field order
+SAMPLE_FIELDS = SAMPLE_SCHEME.field_names
 
-    @property
-    def samplesheetindex(self):
+
+@compile_scheme(SAMPLE_SCHEME)
+class Sample(Naming):
+    """
+    Builds, reads and validates SEGLH sample naming conventions.
+    Constituent properties, validation and formatting are compiled
+    from SAMPLE_SCHEME
+    """
+    # file type registry
+    file_types = DEFAULT_FILE_TYPES
+
+    _caches = ('_file_suffix',)
+
+    def _parse_file_suffix(self):
         '''
-        Samplesheet index (from dmx):
-            digits prefixed with S
+        Parsed file extension and type (cached until modified)
         '''
-        return self._samplesheetindex
+        suffix = self.__dict__.get('_file_suffix')
+        if suffix is None:
+            if not self.rest:
+                raise ValueError("Not a file name ({})".format(self._name))
+            suffix = self.__dict__['_file_suffix'] = \
+                self.file_types.parse(self.rest)
+        return suffix
 
-    @samplesheetindex.setter
-    def samplesheetindex(self, value):
-        if value and not re.match(r'^S\d+$', value):
-            raise ValueError("Samplesheet index invalid ({})".format(value))
-        self._samplesheetindex = value
+    def file_extension(self, include_compression=True):
+        '''
+        Extracts the file extension if any
+        '''
+        return self._parse_file_suffix()[0 if include_compression else 1]
 
     @property
-    def readnumber(self):
+    def file_type(self):
         '''
-        Read number in pair
-            single digit prefixed by R or I
+        File type of a known file extension (see file_types)
+            string or None
         '''
-        return self._readnumber
-
-    @readnumber.setter
-    def readnumber(self, value):
-        if value and not re.match(r'^[RI]\d$', value):
-            raise ValueError("Readnumber invalid ({})".format(value))
-        self._readnumber = value
+        if not self.rest:
+            return None
+        return self._parse_file_suffix()[2]
 
     @property
-    def stable(self):
+    def sort_key(self):
         '''
-        Stable number from demultiplexing
-            001
+        Natural sort key (cached until modified)
+            library prefix, number and suffix, samplecount,
+            samplesheet index, lane, readnumber, full name
         '''
-        return self._stable
-
-    @stable.setter
-    def stable(self, value):
-        if value and not re.match(r'^001$', value):
-            raise ValueError("Number invalid ({})".format(value))
-        self._stable = value
+        if self._sort_key is None:
+            prefix, number, suffix = \
+                LIBRARYPREP_REGEX.match(self.libraryprep).groups()
+            self._sort_key = (
+                prefix, int(number), suffix,
+                int(self.samplecount),
+                int(self.samplesheetindex[1:]) if self.samplesheetindex else -1,
+                int(self.lane[1:]) if self.lane else -1,
+                self.readnumber or '',
+                repr(self)
+            )
+        return self._sort_key
 
+    # check if is a  file name
     @property
-    def rest(self):
+    def is_file(self):
         '''
-        Remainder of the parsed string (e.g. rest of filename)
-            a string of any length
+        indicate if was built from file/path (inferred)
+            bool
         '''
-        return self._rest or ''
-
-    @rest.setter
-    def rest(self, value):
-        if value and not re.match(r'^[\w\.]*$', value):
-            raise ValueError("Unrecognised characters in parsed name ({})"
-                             .format(value))
-        self._rest = value
+        return bool(self.rest) or bool(self.path)
 
 
 if __name__ == "__main__":
@@ -2,13 +2,12 @@
 Builds, reads and validates SEGLH samplesheet naming conventions
 '''
 
-import os
 import sys
-import re
-import hashlib
+import io
+import csv
 
-# salt used to generate anonymised function'
-SALT = 'jdhFeducf2gkFb2jj7hjs345klosboiydbo73u7g390yubfkd'
+from .scheme import Field, Scheme, Naming, compile_scheme, SALT  # noqa: F401
+from .sample import Sample
 
 # 211008_A01229_0040_AHKGTFDRXY_SampleSheet
 # samplesheet name regular expression
@@ -21,114 +20,166 @@ SAMPLE_REGEX = (
     r'(.[\w]+)' # fileext
     )
 
-# samplesheet name constituent field order
-SAMPLESHEET_FIELDS = [
-    'date',
-    'sequencerid',
-    'autoincrno',
-    'flowcellid',
-    'samplesheetstr',
-    'fileext'
-]
-
+# samplesheet naming scheme (constituents in field order)
+SAMPLESHEET_SCHEME = Scheme(
+    regex=SAMPLE_REGEX,
+    fields=[
+        Field('date', r'^[\d]{6}$',
+              "Date invalid ({})", doc='''
+        Date
+        '''),
+        Field('sequencerid', r'^[A-Z0-9]+$',
+              "Sequencer ID invalid ({})", doc='''
+        Sequencer identifier
+            Alphanumeric string that may contain hyphen
+        '''),
+        Field('autoincrno', r'^\d{4}$',
+              "Autoincrementing number invalid ({})", doc='''
+        Auto-incrementing number
+            4 digits
+        '''),
+        Field('flowcellid', r'^([0]{9}-[A-Z0-9]{5}|[A-Z0-9]{10})$',
+              "Flowcell ID invalid ({})", doc='''
+        Flowcell ID:
+            Alpha numeric string
+        '''),
+        Field('samplesheetstr', r'^SampleSheet$',
+              "SampleSheet string invalid ({})", doc='''
+        SampleSheet string:
+            String matching 'SampleSheet' exactly
+        '''),
+        Field('fileext', r'^.csv$',
+              "File extension invalid ({})", doc='''
+        File extension:
+            String matching '.csv' exactly
+        '''),
+    ],
+    # samplesheet name
+    short=['date', 'sequencerid', 'autoincrno', 'flowcellid',
+           'samplesheetstr', 'fileext'],
+    full=['date', 'sequencerid', 'autoincrno', 'flowcellid',
+          'samplesheetstr', 'fileext'],
+    suffix='fileext'
+)
 
-class Samplesheet(object):
+# samplesheet name constituent field order
+SAMPLESHEET_FIELDS = SAMPLESHEET_SCHEME.field_names
+
+# samplesheet sections listing the samples (v1 and v2 samplesheets)
+DATA_SECTIONS = ('[Data]', '[BCLConvert_Data]')
+
+# samplesheet data columns holding sample names
+SAMPLE_COLUMNS = ('Sample_ID', 'Sample_Name')
+
+
+def _lane(cell):
+    '''
+    Lane of a samplesheet Lane column (e.g. '1' -> 'L001')
+    '''
+    try:
+        return 'L{:03d}'.format(int(cell))
+    except ValueError:
+        raise ValueError('Lane invalid ({})'.format(cell.strip()))
+
+
+def read_samples(lines):
+    '''
+    Reads and validates the sample names in the data section of samplesheet
+    content (any iterable of lines, e.g. an open file) and returns the
+    Sample for each data row (with the lane of the row if the samplesheet
+    has a Lane column). Other sections are skipped without parsing.
+    Errors of all rows are aggregated and reported by row (line) number
+    '''
+    # skip to data section
+    lines = iter(lines)
+    offset = 0
+    for line in lines:
+        offset += 1
+        if line.split(',', 1)[0].strip() in DATA_SECTIONS:
+            break
+    else:
+        raise ValueError('No data section in samplesheet ({})'.format(
+            ', '.join(DATA_SECTIONS)))
+    reader = csv.reader(lines)
+    header = [column.strip() for column in next(reader, [])]
+    try:
+        sample_id = header.index(SAMPLE_COLUMNS[0])
+    except ValueError:
+        raise ValueError('No {} column in samplesheet data section'.format(
+            SAMPLE_COLUMNS[0]))
+    sample_name = header.index(SAMPLE_COLUMNS[1]) \
+        if SAMPLE_COLUMNS[1] in header else None
+    lane = header.index('Lane') if 'Lane' in header else None
+    samples = []
+    samplecounts = {}
+    parsed = {}  # samples listed on several lanes are parsed once
+    collected_errors = []
+    for row in reader:
+        if not any(row):
+            continue
+        if row[0].startswith('['):
+            break  # next section
+        rownumber = offset + reader.line_num
+        cells = row + [''] * (len(header) - len(row))
+        try:
+            sample = parsed.get(cells[sample_id])
+            if sample is None:
+                sample = Sample.from_string(cells[sample_id].strip())
+                parsed[cells[sample_id]] = sample
+            name = cells[sample_name].strip() \
+                if sample_name is not None else None
+            if name and name != str(sample) and name != repr(sample):
+                Sample.from_string(name)
+            if lane is not None:
+                sample = sample.replace(lane=_lane(cells[lane]))
+        except ValueError as e:
+            collected_errors.append('Row {}: {}'.format(rownumber, e))
+            continue
+        # samplecount must be unique within library (and lane)
+        key = (cells[lane] if lane is not None else None,
+               sample.libraryprep, sample.samplecount)
+        if key in samplecounts:
+            collected_errors.append(
+                'Row {}: Duplicate samplecount ({}, see row {})'.format(
+                    rownumber, sample.samplecount, samplecounts[key]))
+            continue
+        samplecounts[key] = rownumber
+        samples.append(sample)
+    if collected_errors:
+        raise ValueError(", ".join(collected_errors))
+    return samples
+
+
+@compile_scheme(SAMPLESHEET_SCHEME)
+class Samplesheet(Naming):
     """
     Builds, reads and validates SEGLH samplesheet naming conventions
+    Constituent properties, validation and formatting are compiled
+    from SAMPLESHEET_SCHEME
     """
-    def __init__(self, **kwargs):
-        '''
-        parses the samplesheet name (or file name)
-        calls the builder which validates each element
-        '''
-        self._path = kwargs.get('path')
-        self._build_name(kwargs)
-        self._is_modified=False
-
-    def __setattr__(self, key, value):
-        if key != '_is_modified':
-            self._is_modified = True
-        super(Samplesheet, self).__setattr__(key, value)
-
-    @classmethod
-    def from_string(cls, fullname):
-        assert isinstance(fullname, str)
-        dirs = fullname.split('/')
-        name = dirs[-1]
-        path = '/'.join(dirs[:-1])
-        m = re.match(SAMPLE_REGEX, name)
-        try:
-            assert m
-        except AssertionError:
-            raise ValueError('Wrong naming format ({})'.format(name))
-        else:
-            constituents = dict(zip(SAMPLESHEET_FIELDS, m.groups()))
-            constituents['name'] = name
-            constituents['path'] = path
-            return cls(**constituents)
-
-    def _build_name(self, constituents):
-        '''
-        build samplesheet name string
-        validate construct and each constituent element
-        aggregates errors for different fields
-        '''
-        collected_errors = []
-        for field in SAMPLESHEET_FIELDS:
-            try:
-                if field in constituents.keys() and \
-                        constituents[field] is not None:
-                    setattr(self, field, str(constituents[field]))
-                else:
-                    setattr(self, field, None)
-            except Exception as e:
-                collected_errors.append(str(e))
-        if collected_errors:
-            raise ValueError(", ".join(collected_errors))
-
-    def __str__(self):
-        '''
-        Returns the samplesheet name
-        '''
-        return "_".join(filter(lambda x: x, [
-            self.date,
-            self.sequencerid,
-            self.autoincrno,
-            self.flowcellid,
-            self.samplesheetstr
-        ])) + self.fileext
-
-    def __repr__(self):
-        '''
-        returns the full parsed string
-        '''
-        filename = "_".join(filter(lambda x: x, [
-            self.date,
-            self.sequencerid,
-            self.autoincrno,
-            self.flowcellid,
-            self.samplesheetstr
-        ])) + self.fileext
-        return os.path.join(self.path, filename)
-
-    def hash(self):
+    @property
+    def sort_key(self):
         '''
-        A stable cryptographic hash to obfuscate samplesheet name if required
+        Natural sort key (cached until modified)
+            date, sequencer, run number, flowcell, full name
         '''
-        s = str(self) + SALT
-        s_encoded = s.encode('utf-8')
-        h = hashlib.new('sha256')
-        h.update(s_encoded)
-        return h.hexdigest()
+        if self._sort_key is None:
+            self._sort_key = (
+                self.date,
+                self.sequencerid,
+                int(self.autoincrno),
+                self.flowcellid,
+                repr(self)
+            )
+        return self._sort_key
 
-    # check if any elment has been modified
-    @property
-    def is_modified(self):
+    def read_samples(self):
         '''
-        returns True if any constituent part of the samplesheet name
-        has been modified after the initial parsing
+        Reads and validates all sample names in the data section
+        of the samplesheet file (streamed)
         '''
-        return self._is_modified
+        with io.open(repr(self), newline='') as fh:
+            return read_samples(fh)
 
     # check if is a  file name
     @property
@@ -139,98 +190,6 @@ class Samplesheet(object):
         '''
         return bool(self.path)
 
-    @property
-    def path(self):
-        '''
-        File path (if initialised from string)
-            string
-        '''
-        return self._path
-
-    # value properties
-    @property
-    def date(self):
-        '''
-        Date
-        '''
-        return self._date
-
-    @date.setter
-    def date(self, value):
-        if not re.match(r'^[\d]{6}$', value):
-            raise ValueError("Date invalid ({})".format(value))
-        self._date = value
-
-    @property
-    def sequencerid(self):
-        '''
-        Sequencer identifier
-            Alphanumeric string that may contain hyphen
-        '''
-        return self._sequencerid
-
-    @sequencerid.setter
-    def sequencerid(self, value):
-        if not re.match(r'^[A-Z0-9]+$', value):
-            raise ValueError("Sequencer ID invalid ({})".format(value))
-        self._sequencerid = value
-
-    @property
-    def autoincrno(self):
-        '''
-        Auto-incrementing number
-            4 digits
-        '''
-        return self._autoincrno
-
-    @autoincrno.setter
-    def autoincrno(self, value):
-        if not re.match(r'^\d{4}$', value):
-            raise ValueError("Autoincrementing number invalid ({})".format(value))
-        self._autoincrno = value
-
-    @property
-    def flowcellid(self):
-        '''
-        Flowcell ID:
-            Alpha numeric string
-        '''
-        return self._flowcellid
-
-    @flowcellid.setter
-    def flowcellid(self, value):
-        if not re.match(r'^([0]{9}-[A-Z0-9]{5}|[A-Z0-9]{10})$', value):
-            raise ValueError("Flowcell ID invalid ({})".format(value))
-        self._flowcellid = value
-
-    @property
-    def samplesheetstr(self):
-        '''
-        SampleSheet string:
-            String matching 'SampleSheet' exactly
-        '''
-        return self._samplesheetstr
-
-    @samplesheetstr.setter
-    def samplesheetstr(self, value):
-        if not re.match(r'^SampleSheet$', value):
-            raise ValueError("SampleSheet string invalid ({})".format(value))
-        self._samplesheetstr = value
-
-    @property
-    def fileext(self):
-        '''
-        File extension:
-            String matching '.csv' exactly
-        '''
-        return self._fileext
-
-    @fileext.setter
-    def fileext(self, value):
-        if not re.match(r'^.csv$', value):
-            raise ValueError("File extension invalid ({})".format(value))
-        self._fileext = value
-
 
 if __name__ == "__main__":
-    Samplesheet.from_string(sys.argv[1])
\ No newline at end of file
+    Samplesheet.from_string(sys.argv[1])
@@ -0,0 +1,491 @@
+'''
+Declarative naming scheme definitions compiled into name classes
+
+A scheme lists the constituents (fields) of a name in the order of the
+groups of the name regular expression, the rule each constituent must
+match, which constituents form the short (str) and full (repr) name and
+the requirements across constituents. compile_scheme generates the
+validating properties, the name builder and the string formatting of a
+class from its scheme with precompiled rules, so variant schemes run the
+same specialised code as the default ones.
+'''
+
+import os
+import re
+import hashlib
+import operator
+
+from .buffer import split_path, decode
+
+# salt used to generate anonymised function'
+SALT = 'jdhFeducf2gkFb2jj7hjs345klosboiydbo73u7g390yubfkd'
+
+
+class Field(object):
+    """
+    Naming scheme constituent
+        name: constituent (property) name
+        rule: regular expression a (non empty) value must match
+        error: validation error message, formatted with the value
+        optional: may be empty
+        default: value returned if empty
+        doc: property docstring
+    """
+    def __init__(self, name, rule, error, optional=False, default=None,
+                 doc=None):
+        self.name = name
+        self.rule = rule
+        self.error = error
+        self.optional = optional
+        self.default = default
+        self.doc = doc
+
+    def replace(self, **changes):
+        '''
+        Returns a copy of the field with changed attributes
+        '''
+        attributes = dict(self.__dict__)
+        attributes.update(changes)
+        return Field(**attributes)
+
+
+class Scheme(object):
+    """
+    Naming scheme
+        regex: name regular expression (one group per field, in order)
+        fields: constituents (Field)
+        short: fields of the short name (str)
+        full: fields of the full name (repr)
+        suffix: field appended without separator (e.g. file extension)
+        requirements: functions raising ValueError if the built name
+            does not meet a requirement across constituents
+            (see depends_on to declare the constituents checked)
+    """
+    def __init__(self, regex, fields, short, full, suffix=None,
+                 requirements=(), separator='_'):
+        self.regex = regex
+        self.fields = list(fields)
+        self.short = list(short)
+        self.full = list(full)
+        self.suffix = suffix
+        self.requirements = list(requirements)
+        self.separator = separator
+
+    @property
+    def field_names(self):
+        return [field.name for field in self.fields]
+
+    def field(self, name):
+        for field in self.fields:
+            if field.name == name:
+                return field
+        raise ValueError("Unknown field ({})".format(name))
+
+    def replace(self, **changes):
+        '''
+        Returns a copy of the scheme with changed attributes
+        '''
+        attributes = dict(self.__dict__)
+        attributes.update(changes)
+        return Scheme(**attributes)
+
+    def replace_field(self, name, **changes):
+        '''
+        Returns a copy of the scheme with changed field attributes
+        '''
+        self.field(name)
+        return self.replace(fields=[
+            field.replace(**changes) if field.name == name else field
+            for field in self.fields
+        ])
+
+
+def depends_on(*fields):
+    '''
+    Declares the constituents a requirement depends on, it is only
+    rechecked by replace if one of them changes
+    '''
+    def decorator(requirement):
+        requirement.fields = frozenset(fields)
+        return requirement
+    return decorator
+
+
+def _getter(attribute, default):
+    getter = operator.attrgetter(attribute)
+    if default is None:
+        return getter
+    return lambda self: getter(self) or default
+
+
+def _setter(attribute, match, error, optional):
+    if optional:
+        def setter(self, value):
+            if value and not match(value):
+                raise ValueError(error.format(value))
+            setattr(self, attribute, value)
+    else:
+        def setter(self, value):
+            if value is None or not match(value):
+                raise ValueError(error.format(value))
+            setattr(self, attribute, value)
+    return setter
+
+
+def _validator(match, error, optional):
+    '''
+    Validates a raw (str or bytes) constituent on first access (lazy mode)
+    '''
+    def validate(value):
+        if isinstance(value, bytes):
+            value = decode(value)
+        elif value is not None:
+            value = str(value)
+        if (value or not optional) and (value is None or not match(value)):
+            raise ValueError(error.format(value))
+        return value
+    return validate
+
+
+def _join(scheme, fields):
+    '''
+    Source of the expression joining the non-empty fields
+    (the suffix field is appended without separator)
+    '''
+    source = '{!r}.join(filter(None, ({},)))'.format(
+        scheme.separator,
+        ', '.join('self._' + f for f in fields if f != scheme.suffix))
+    if scheme.suffix in fields:
+        source += " + (self._{} or '')".format(scheme.suffix)
+    return source
+
+
+def _compile_methods(scheme, namespace):
+    '''
+    Generates the name builder and string formatting of the scheme
+    '''
+    lines = [
+        'def _build_name(self, constituents):',
+        '    collected_errors = []',
+        '    state = {}',
+        '    get = constituents.get',
+    ]
+    for i, field in enumerate(scheme.fields):
+        check = 'value and not match_{}(value)' if field.optional \
+            else 'value is None or not match_{}(value)'
+        lines += [
+            '    value = get({!r})'.format(field.name),
+            '    if value is not None:',
+            '        value = str(value)',
+            '    if ' + check.format(i) + ':',
+            '        collected_errors.append(error_{}.format(value))'.format(i),
+            '    state[{!r}] = value'.format('_' + field.name),
+        ]
+    lines += [
+        '    if collected_errors:',
+        '        raise ValueError(", ".join(collected_errors))',
+        '    # only stored if all constituents are valid',
+        '    self.__dict__.update(state)',
+        '',
+        'def __str__(self):',
+        '    return ' + _join(scheme, scheme.short),
+        '',
+        'def __repr__(self):',
+        '    return os.path.join(self._path or "", {})'.format(
+            _join(scheme, scheme.full)),
+    ]
+    code = compile('\n'.join(lines), '<scheme>', 'exec')
+    exec(code, namespace)
+
+
+def compile_scheme(scheme):
+    '''
+    Class decorator compiling the scheme into the class
+    '''
+    def decorator(cls):
+        namespace = {'os': os}
+        validators = {}
+        for i, field in enumerate(scheme.fields):
+            match = re.compile(field.rule).match
+            namespace['match_{}'.format(i)] = match
+            namespace['error_{}'.format(i)] = field.error
+            validators['_' + field.name] = \
+                _validator(match, field.error, field.optional)
+            setattr(cls, field.name, property(
+                _getter('_' + field.name, field.default),
+                _setter('_' + field.name, match, field.error, field.optional),
+                doc=field.doc))
+        _compile_methods(scheme, namespace)
+        cls._build_name = namespace['_build_name']
+        cls.__str__ = namespace['__str__']
+        cls.__repr__ = namespace['__repr__']
+        cls._scheme = scheme
+        cls._fields = tuple(scheme.field_names)
+        cls._regex = re.compile(scheme.regex)
+        cls._regex_bytes = re.compile(scheme.regex.encode('ascii'))
+        cls._requirements = tuple(scheme.requirements)
+        cls._validators = validators
+        return cls
+    return decorator
+
+
+def build_class(name, scheme, base):
+    '''
+    Builds a name class for a (variant) scheme, inheriting
+    all other behaviour from base (e.g. Sample)
+    '''
+    return compile_scheme(scheme)(type(name, (base,), {}))
+
+
+class Naming(object):
+    """
+    Shared behaviour of names built from a compiled scheme
+    (see compile_scheme)
+    """
+    # attributes caching values derived from constituents
+    # (dropped when modified)
+    _caches = ()
+
+    def __init__(self, **kwargs):
+        '''
+        Parses the name (or file name)
+        Calls the builder which validates each element
+        '''
+        self._path = kwargs.get('path')
+        if kwargs.get('name') is not None:
+            # otherwise built on demand (e.g. from_dict)
+            self._name = kwargs['name']
+        self._build_name(kwargs)
+        self._check_requirements()
+        self._is_modified = False
+
+    @classmethod
+    def _lazy(cls, constituents):
+        '''
+        Creates instance validating each constituent on first access
+        '''
+        self = cls.__new__(cls)
+        state = self.__dict__
+        state['_path'] = constituents.pop('path', None)
+        state['_name'] = constituents.pop('name', None)
+        state['_pending'] = constituents
+        state['_sort_key'] = None
+        state['_is_modified'] = False
+        return self
+
+    def __getattr__(self, key):
+        '''
+        Validates and caches pending constituents (lazy mode)
+        Name of built names and copies (replace) is built on demand
+        '''
+        if key == '_name':
+            return os.path.basename(repr(self))
+        pending = self.__dict__.get('_pending')
+        if pending is None or key not in self._validators:
+            raise AttributeError(key)
+        value = self._validators[key](pending.get(key[1:]))
+        self.__dict__[key] = value
+        return value
+
+    def __setattr__(self, key, value):
+        if key not in ('_is_modified', '_sort_key'):
+            self._is_modified = True
+            self._sort_key = None
+            for cache in self._caches:
+                self.__dict__.pop(cache, None)
+        super(Naming, self).__setattr__(key, value)
+
+    def _comparable(self, other):
+        return isinstance(other, type(self)) or isinstance(self, type(other))
+
+    def __lt__(self, other):
+        if not self._comparable(other):
+            return NotImplemented
+        return self.sort_key < other.sort_key
+
+    def __le__(self, other):
+        if not self._comparable(other):
+            return NotImplemented
+        return self.sort_key <= other.sort_key
+
+    def __gt__(self, other):
+        if not self._comparable(other):
+            return NotImplemented
+        return self.sort_key > other.sort_key
+
+    def __ge__(self, other):
+        if not self._comparable(other):
+            return NotImplemented
+        return self.sort_key >= other.sort_key
+
+    @classmethod
+    def from_string(cls, fullname, lazy=False):
+        """
+        Get name constituents from string input
+        If lazy, only the naming format is checked, constituents are
+        validated on first access and requirements by validate()
+        """
+        assert isinstance(fullname, str)
+        dirs = fullname.split('/')
+        name = dirs[-1]
+        path = '/'.join(dirs[:-1])
+        match = cls._regex.match(name)
+        if not match:
+            raise ValueError('Wrong naming format ({})'.format(name))
+        return cls._from_groups(match.groups(), name, path, lazy)
+
+    @classmethod
+    def _from_groups(cls, groups, name, path, lazy=False):
+        """
+        Creates instance from the matched constituents (in field order)
+        """
+        constituents = dict(zip(cls._fields, groups))
+        constituents['name'] = name
+        constituents['path'] = path
+        if lazy:
+            return cls._lazy(constituents)
+        return cls(**constituents)
+
+    @classmethod
+    def from_bytes(cls, fullname, lazy=False):
+        """
+        Get name constituents from bytes-like input
+        (bytes, bytearray or memoryview, e.g. from split_names)
+        The buffer is matched in place, only matched constituents are decoded
+        If lazy, constituents are decoded and validated on first access
+        """
+        assert isinstance(fullname, (bytes, bytearray, memoryview))
+        path, start = split_path(fullname)
+        match = cls._regex_bytes.match(fullname, start)
+        name = decode(fullname[start:])
+        if not match:
+            raise ValueError('Wrong naming format ({})'.format(name))
+        if lazy:
+            constituents = dict(zip(cls._fields, match.groups()))
+            constituents['name'] = name
+            constituents['path'] = decode(path)
+            return cls._lazy(constituents)
+        constituents = dict(zip(cls._fields, map(decode, match.groups())))
+        constituents['name'] = name
+        constituents['path'] = decode(path)
+        return cls(**constituents)
+
+    @classmethod
+    def from_dict(cls, constituents):
+        """
+        Get name constituents from dictionary input
+        """
+        assert isinstance(constituents, dict)
+        constituents = dict(constituents)
+        if constituents.get('path') is None:
+            constituents['path'] = ''
+        return cls(**constituents)
+
+    def replace(self, **changes):
+        '''
+        Returns a copy with changed constituents (or path)
+        Only the changed constituents and the requirements
+        depending on them are validated
+        '''
+        return self.replace_many([self], **changes)[0]
+
+    @classmethod
+    def replace_many(cls, names, **changes):
+        '''
+        Returns copies of names with the same changes applied
+        The changes are validated once for all names
+        '''
+        state = {}
+        collected_errors = []
+        for field, value in changes.items():
+            if field == 'path':
+                state['_path'] = value
+                continue
+            validator = cls._validators.get('_' + field)
+            if validator is None:
+                collected_errors.append("Unknown field ({})".format(field))
+                continue
+            try:
+                state['_' + field] = validator(value)
+            except ValueError as e:
+                collected_errors.append(str(e))
+        if collected_errors:
+            raise ValueError(", ".join(collected_errors))
+        state['_sort_key'] = None
+        state['_is_modified'] = bool(changes)
+        requirements = [
+            requirement for requirement in cls._requirements
+            if not set(changes).isdisjoint(
+                getattr(requirement, 'fields', changes))
+        ]
+        copies = []
+        for name in names:
+            copy = name.__class__.__new__(name.__class__)
+            copy.__dict__.update(name.__dict__)
+            copy.__dict__.update(state)
+            copy.__dict__.pop('_name', None)
+            for cache in cls._caches:
+                copy.__dict__.pop(cache, None)
+            for requirement in requirements:
+                requirement(copy)
+            copies.append(copy)
+        return copies
+
+    def validate(self):
+        '''
+        Validates all constituents (pending if lazy) and requirements
+        aggregates errors for different fields
+        '''
+        state = self.__dict__
+        pending = state.get('_pending')
+        if pending is not None:
+            constituents = {}
+            for field in self._fields:
+                value = state.get('_' + field, pending.get(field))
+                constituents[field] = decode(value) \
+                    if isinstance(value, bytes) else value
+            self._build_name(constituents)
+            del state['_pending']
+        self._check_requirements()
+        return self
+
+    def _check_requirements(self):
+        '''
+        Checks the requirements across constituents of the scheme
+        aggregates errors for different requirements
+        '''
+        collected_errors = []
+        for requirement in self._requirements:
+            try:
+                requirement(self)
+            except ValueError as e:
+                collected_errors.append(str(e))
+        if collected_errors:
+            raise ValueError(", ".join(collected_errors))
+
+    def hash(self):
+        '''
+        A stable cryptographic hash to obfuscate name if required
+        '''
+        s = str(self) + SALT
+        s_encoded = s.encode('utf-8')
+        h = hashlib.new('sha256')
+        h.update(s_encoded)
+        return h.hexdigest()
+
+    # check if any elment has been modified
+    @property
+    def is_modified(self):
+        '''
+        returns True if any constituent part of the name
+        has been modified after the initial parsing
+        '''
+        return self._is_modified
+
+    @property
+    def path(self):
+        '''
+        File path (if initialised from string)
+            string
+        '''
+        return self._path
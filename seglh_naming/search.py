@@ -0,0 +1,79 @@
+'''
+Prefix search over known sample names (e.g. for autocompletion)
+'''
+
+import bisect
+
+# searchable constituents ('name' is the sample name, str(sample))
+SEARCH_FIELDS = ('name', 'id1', 'id2', 'libraryprep', 'panelname')
+
+
+class SampleSearch(object):
+    """
+    Sorted array of the distinct values of each searchable constituent
+    with the samples for each value. Prefix queries bisect to the first
+    matching value and read matches in order until the limit is reached
+    """
+    def __init__(self, samples=()):
+        self._samples = []
+        self._values = dict((field, []) for field in SEARCH_FIELDS)
+        self._postings = dict((field, {}) for field in SEARCH_FIELDS)
+        self.update(samples)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def add(self, sample):
+        '''
+        Adds a single sample (e.g. from a newly registered run)
+        '''
+        self.update([sample])
+
+    def update(self, samples):
+        '''
+        Adds samples, new values are merged into the sorted arrays
+        '''
+        added = dict((field, []) for field in SEARCH_FIELDS)
+        for sample in samples:
+            position = len(self._samples)
+            self._samples.append(sample)
+            for field in SEARCH_FIELDS:
+                value = str(sample) if field == 'name' \
+                    else getattr(sample, field)
+                if value is None:
+                    continue
+                postings = self._postings[field]
+                if value not in postings:
+                    postings[value] = []
+                    added[field].append(value)
+                postings[value].append(position)
+        for field, new in added.items():
+            values = self._values[field]
+            if len(new) == 1:
+                bisect.insort(values, new[0])
+            elif new:
+                values.extend(new)
+                values.sort()
+
+    def search(self, prefix, fields=SEARCH_FIELDS, limit=10):
+        '''
+        Returns up to limit samples with a constituent starting with prefix
+        Fields are searched in order, values in sorted order
+        '''
+        found = []
+        seen = set()
+        for field in fields:
+            if field not in self._values:
+                raise ValueError("Unknown search field ({})".format(field))
+            values = self._values[field]
+            postings = self._postings[field]
+            i = bisect.bisect_left(values, prefix)
+            while i < len(values) and values[i].startswith(prefix):
+                for position in postings[values[i]]:
+                    if position not in seen:
+                        seen.add(position)
+                        found.append(self._samples[position])
+                        if len(found) >= limit:
+                            return found
+                i += 1
+        return found
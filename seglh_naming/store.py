@@ -0,0 +1,245 @@
+'''
+Read-only, memory-mapped store of sorted sample/file names
+
+Names are front-coded in blocks: the first name of each block is stored
+in full, the following names as the length of the prefix shared with the
+previous name and the remaining suffix. Exact lookups and range scans
+binary search the block offsets and decode a single block at a time.
+
+File layout (little-endian)
+    header: magic, block size (uint32), count (uint64),
+            block offset table position (uint64)
+    blocks: varint length + name | varint shared + varint length + suffix
+    block offset table: uint64 per block
+'''
+
+import os
+import mmap
+import array
+import struct
+
+from .sample import Sample
+
+MAGIC = b'SEGLHFC1'
+HEADER = struct.Struct('<8sIQQ')
+OFFSET = struct.Struct('<Q')
+
+# number of names per front-coded block
+BLOCK_SIZE = 16
+
+
+def _varint(value):
+    '''
+    Encodes unsigned integer as LEB128 varint
+    '''
+    encoded = bytearray()
+    while value >= 0x80:
+        encoded.append((value & 0x7f) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _read_varint(buf, position):
+    '''
+    Decodes LEB128 varint at position, returns value and next position
+    '''
+    value = 0
+    shift = 0
+    while True:
+        byte = buf[position]
+        position += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _keys(samples):
+    '''
+    Encoded full names (repr) of samples sorted by full name, adjacent
+    duplicates are skipped. Strings (e.g. lines of a sorted listing) are
+    validated as sample names
+    '''
+    previous = None
+    for sample in samples:
+        if not isinstance(sample, Sample):
+            sample = sample.rstrip('\r\n')
+            if not sample:
+                continue
+            sample = Sample.from_string(sample)
+        key = repr(sample).encode('utf-8')
+        if previous is not None and key <= previous:
+            if key == previous:
+                continue
+            raise ValueError("Names not sorted ({} after {})".format(
+                key.decode('utf-8'), previous.decode('utf-8')))
+        previous = key
+        yield key
+
+
+def write_store(path, samples, block_size=BLOCK_SIZE):
+    '''
+    Streams the full names (repr) of samples, sorted by full name (e.g.
+    LC_ALL=C sort -u), to a front-coded store without holding them in memory
+    Unsorted input raises ValueError (no store is written).
+    Returns the number of names
+    '''
+    try:
+        with open(path, 'wb') as fh:
+            count = _write_blocks(fh, _keys(samples), block_size)
+    except ValueError:
+        os.remove(path)
+        raise
+    return count
+
+
+def _write_blocks(fh, keys, block_size):
+    '''
+    Writes header, front-coded blocks and block offset table
+    Returns the number of names
+    '''
+    fh.write(HEADER.pack(MAGIC, block_size, 0, 0))
+    position = HEADER.size
+    offsets = array.array('Q')  # compact, one entry per block
+    previous = b''
+    count = 0
+    for key in keys:
+        if count % block_size == 0:
+            offsets.append(position)
+            chunk = _varint(len(key)) + key
+        else:
+            shared = len(os.path.commonprefix([previous, key]))
+            chunk = _varint(shared) + _varint(len(key) - shared) + \
+                key[shared:]
+        fh.write(chunk)
+        position += len(chunk)
+        previous = key
+        count += 1
+    for offset in offsets:
+        fh.write(OFFSET.pack(offset))
+    fh.seek(0)
+    fh.write(HEADER.pack(MAGIC, block_size, count, position))
+    return count
+
+
+class NameStore(object):
+    """
+    Memory-mapped, read-only front-coded name store (see write_store)
+    Lookups and scans return parsed samples
+    """
+    def __init__(self, path):
+        self._fh = open(path, 'rb')
+        self._map = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._block_size, self._count, self._table = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("Not a name store ({})".format(path))
+        self._blocks = (self._count + self._block_size - 1) // \
+            self._block_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._map.close()
+        self._fh.close()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, name):
+        return self._find(name) is not None
+
+    def __iter__(self):
+        return self.scan()
+
+    def _offset(self, block):
+        return OFFSET.unpack_from(self._map, self._table + block * OFFSET.size)[0]
+
+    def _first(self, block):
+        '''
+        First name of block (stored in full)
+        '''
+        length, position = _read_varint(self._map, self._offset(block))
+        return self._map[position:position + length]
+
+    def _decode(self, block):
+        '''
+        Yields the names of block
+        '''
+        length, position = _read_varint(self._map, self._offset(block))
+        key = self._map[position:position + length]
+        yield key
+        position += length
+        last = min(self._block_size, self._count - block * self._block_size)
+        for _ in range(last - 1):
+            shared, position = _read_varint(self._map, position)
+            length, position = _read_varint(self._map, position)
+            key = key[:shared] + self._map[position:position + length]
+            position += length
+            yield key
+
+    def _search(self, key):
+        '''
+        Block that may contain key (last block starting at or before key)
+        '''
+        low, high = 0, self._blocks
+        while low < high:
+            middle = (low + high) // 2
+            if self._first(middle) <= key:
+                low = middle + 1
+            else:
+                high = middle
+        return max(low - 1, 0)
+
+    def _find(self, name):
+        if not self._count:
+            return None
+        key = name.encode('utf-8')
+        for candidate in self._decode(self._search(key)):
+            if candidate == key:
+                return candidate
+            if candidate > key:
+                break
+        return None
+
+    def get(self, name):
+        '''
+        Returns the parsed sample if the name is stored, else None
+        '''
+        key = self._find(name)
+        return Sample.from_string(key.decode('utf-8')) if key else None
+
+    def _scan(self, start, stop):
+        if not self._count:
+            return
+        for block in range(self._search(start), self._blocks):
+            for key in self._decode(block):
+                if stop is not None and key >= stop:
+                    return
+                if key >= start:
+                    yield key
+
+    def scan(self, start=None, stop=None):
+        '''
+        Yields the samples with start <= name < stop (in name order)
+        '''
+        start = start.encode('utf-8') if start is not None else b''
+        stop = stop.encode('utf-8') if stop is not None else None
+        for key in self._scan(start, stop):
+            yield Sample.from_string(key.decode('utf-8'))
+
+    def prefix(self, prefix):
+        '''
+        Yields the samples whose full name starts with prefix
+        '''
+        prefix = prefix.encode('utf-8')
+        for key in self._scan(prefix, None):
+            if not key.startswith(prefix):
+                return
+            yield Sample.from_string(key.decode('utf-8'))
@@ -0,0 +1,240 @@
+'''
+Suggests corrections for invalid sample names
+
+Known valid constituents (e.g. library preparations, panel names and
+numbers, recent DNA numbers) are indexed in BK-trees, which only visit the
+branches within the edit distance of the queried value. Invalid names are
+rewritten for common slips (hyphens, lowercase initials, swapped fields)
+and the failing constituents substituted with their nearest known values.
+'''
+
+import re
+
+from .sample import Sample
+
+# constituents indexed for suggestions
+SUGGEST_FIELDS = ('libraryprep', 'panelname', 'panelnumber', 'id1', 'id2')
+
+# validation error message -> constituent
+FIELD_ERRORS = {
+    'LibraryPrep name invalid': 'libraryprep',
+    'Specimen/DNA number invalid': 'id1',
+    'Secondary identifier invalid': 'id2',
+    'Panel Name invalid': 'panelname',
+    'Pan Number invalid': 'panelnumber',
+}
+
+# validation errors in (aggregated) error message
+ERROR_REGEX = re.compile(r'(?:^|, )([^,(]+?) \(([^)]*)\)')
+
+
+def distance(a, b):
+    '''
+    Edit distance counting insertions, deletions, substitutions and
+    transpositions (unrestricted Damerau-Levenshtein). Unlike the optimal
+    string alignment distance it is a metric (triangle inequality), as
+    required by BKTree
+    '''
+    if a == b:
+        return 0
+    # common prefix and suffix do not change the distance
+    start = 0
+    shortest = min(len(a), len(b))
+    while start < shortest and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < shortest - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a = a[start:len(a) - end]
+    b = b[start:len(b) - end]
+    if not a or not b:
+        return len(a) + len(b)
+    # d[i + 1][j + 1]: distance of a[:i] and b[:j], row and column 0 are
+    # a bound above any distance (Lowrance-Wagner)
+    bound = len(a) + len(b)
+    d = [[bound] * (len(b) + 2)] + \
+        [[bound, i] + [0] * len(b) for i in range(len(a) + 1)]
+    d[1][1:] = range(len(b) + 1)
+    last_row = {}  # last row of each character of a
+    for i in range(1, len(a) + 1):
+        x = a[i - 1]
+        last_column = 0  # last column matching x in this row
+        for j in range(1, len(b) + 1):
+            y = b[j - 1]
+            k = last_row.get(y, 0)
+            m = last_column
+            if x == y:
+                cost = 0
+                last_column = j
+            else:
+                cost = 1
+            d[i + 1][j + 1] = min(
+                d[i][j] + cost, d[i + 1][j] + 1, d[i][j + 1] + 1,
+                # transposition, with the characters in between edited
+                d[k][m] + (i - k - 1) + 1 + (j - m - 1))
+        last_row[x] = i
+    return d[-1][-1]
+
+
+class BKTree(object):
+    """
+    Burkhard-Keller tree for nearest neighbour queries in edit distance
+    """
+    def __init__(self, values=()):
+        self._root = None
+        self._size = 0
+        self._lengths = (0, 0)  # shortest and longest value
+        for value in values:
+            self.add(value)
+
+    def __len__(self):
+        return self._size
+
+    def add(self, value):
+        '''
+        Adds value (duplicates are ignored)
+        '''
+        if self._root is None:
+            self._root = (value, {})
+            self._size = 1
+            self._lengths = (len(value), len(value))
+            return
+        self._lengths = (min(self._lengths[0], len(value)),
+                         max(self._lengths[1], len(value)))
+        node = self._root
+        while True:
+            d = distance(value, node[0])
+            if d == 0:
+                return
+            child = node[1].get(d)
+            if child is None:
+                node[1][d] = (value, {})
+                self._size += 1
+                return
+            node = child
+
+    def search(self, value, max_distance):
+        '''
+        Values within max_distance
+            sorted list of (distance, value)
+        '''
+        found = []
+        # length difference is a lower bound of the distance
+        if len(value) + max_distance < self._lengths[0] or \
+                len(value) - max_distance > self._lengths[1]:
+            return found
+        stack = [self._root] if self._root else []
+        while stack:
+            node = stack.pop()
+            d = distance(value, node[0])
+            if d <= max_distance:
+                found.append((d, node[0]))
+            for child_distance, child in node[1].items():
+                if d - max_distance <= child_distance <= d + max_distance:
+                    stack.append(child)
+        return sorted(found)
+
+
+def _rewrites(name):
+    '''
+    Variants of the name correcting common slips
+        normalised variants (hyphens, lowercase initials and sex),
+        variants with adjacent fields swapped
+    '''
+    normalised = re.sub(r'_+', '_', name.replace('-', '_'))
+    upper = '_'.join(t.upper() if len(t) <= 2 else t
+                     for t in normalised.split('_'))
+    variants = set([name, normalised, upper])
+    swapped = set()
+    for variant in variants:
+        tokens = variant.split('_')
+        for i in range(len(tokens) - 1):
+            swapped.add('_'.join(
+                tokens[:i] + [tokens[i + 1], tokens[i]] + tokens[i + 2:]))
+    return variants, swapped - variants
+
+
+class Suggester(object):
+    """
+    Indexes known valid constituents and suggests valid names
+    close to invalid ones
+    """
+    def __init__(self, samples=()):
+        self._trees = dict((field, BKTree()) for field in SUGGEST_FIELDS)
+        for sample in samples:
+            self.add(sample)
+
+    def add(self, sample):
+        '''
+        Adds the constituents of a valid sample
+        '''
+        for field in SUGGEST_FIELDS:
+            value = getattr(sample, field)
+            if value is not None:
+                self._trees[field].add(value)
+
+    def nearest(self, field, value, max_distance=2):
+        '''
+        Known values of constituent within max_distance
+            sorted list of (distance, value)
+        '''
+        return self._trees[field].search(value, max_distance)
+
+    def _substitutions(self, name, error, max_distance, cache):
+        '''
+        Names with an invalid constituent replaced by a near known value
+        '''
+        tokens = name.split('_')
+        targets = []
+        for message, value in ERROR_REGEX.findall(error):
+            if message in FIELD_ERRORS and value in tokens:
+                targets.append((FIELD_ERRORS[message], value))
+        if not targets and len(tokens) > 3:
+            # wrong format: DNA number must start with a digit,
+            # a constituent must start with 'Pan'
+            if not tokens[2][:1].isdigit():
+                targets.append(('id1', tokens[2]))
+            if not any(token.startswith('Pan') for token in tokens[3:]):
+                targets.extend(('panelnumber', token) for token in tokens[3:])
+        for field, value in targets:
+            if (field, value) not in cache:
+                cache[field, value] = self.nearest(field, value, max_distance)
+            for _, replacement in cache[field, value]:
+                yield '_'.join(replacement if t == value else t
+                               for t in tokens)
+
+    def suggest(self, name, max_distance=2, limit=5):
+        '''
+        Valid names close to an invalid name (path is kept)
+            list of names, closest first
+        '''
+        path, _, base = name.rpartition('/')
+        prefix = path + '/' if path else ''
+        try:
+            Sample.from_string(base)
+        except ValueError:
+            pass
+        else:
+            return []
+        suggestions = {}
+        cache = {}  # nearest values of constituents shared by variants
+        variants, swapped = _rewrites(base)
+        candidates = []
+        for variant in variants:
+            try:
+                Sample.from_string(variant)
+            except ValueError as e:
+                candidates.extend(self._substitutions(
+                    variant, str(e), max_distance, cache))
+            else:
+                candidates.append(variant)
+        for candidate in candidates + list(swapped):
+            if candidate in suggestions or candidate == base:
+                continue
+            try:
+                Sample.from_string(candidate)
+            except ValueError:
+                continue
+            suggestions[candidate] = distance(base, candidate)
+        ranked = sorted(suggestions, key=lambda x: (suggestions[x], x))
+        return [prefix + suggestion for suggestion in ranked[:limit]]
@@ -0,0 +1,115 @@
+'''
+Concurrent traversal of run folders on high-latency (network) filesystems
+
+Directory listings are fanned out over a bounded thread pool, so that the
+round-trips of many directories overlap. Entries are classified from the
+file type cached by scandir (no extra stat calls) and yielded as DirEntry
+objects, or parsed into samples and samplesheets in a single stream.
+'''
+
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .dispatch import classify, Rejection
+
+# concurrent directory listings
+WORKERS = 16
+
+
+def _list(path):
+    '''
+    Lists a directory
+        (subdirectories, files) as lists of DirEntry
+    '''
+    directories = []
+    files = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            # symlinked directories are not followed (no loops)
+            if entry.is_dir(follow_symlinks=False):
+                directories.append(entry)
+            elif entry.is_file():
+                files.append(entry)
+    return directories, files
+
+
+def _name(entry):
+    return entry.name
+
+
+def _listing(future, path, rejects):
+    '''
+    Result of a listing, unreadable directories are rejected or raised
+    '''
+    try:
+        return future.result()
+    except OSError as e:
+        if rejects is None:
+            raise
+        rejects.append((path, str(e)))
+        return [], []
+
+
+def walk_files(root, max_depth=None, workers=WORKERS, ordered=False,
+               rejects=None):
+    '''
+    Yields the files below root as DirEntry (stat results are cached)
+    max_depth: levels of subdirectories to descend (None for all)
+    ordered: yield in sorted, depth-first order (files before
+             subdirectories) instead of as listings complete
+    Unreadable directories are appended to rejects (list) as (path, error)
+    if provided, raised otherwise
+    '''
+    stack = []  # ordered: (depth, path, future) of queued listings
+    pending = {}  # unordered: future -> (depth, path)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        try:
+            if ordered:
+                stack.append((0, root, pool.submit(_list, root)))
+                while stack:
+                    depth, path, future = stack.pop()
+                    directories, files = _listing(future, path, rejects)
+                    if max_depth is None or depth < max_depth:
+                        # submitted ahead of yielding, listed while consumed
+                        stack.extend(
+                            (depth + 1, entry.path,
+                             pool.submit(_list, entry.path))
+                            for entry in sorted(directories, key=_name,
+                                                reverse=True))
+                    for entry in sorted(files, key=_name):
+                        yield entry
+            else:
+                pending[pool.submit(_list, root)] = (0, root)
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        depth, path = pending.pop(future)
+                        directories, files = _listing(future, path, rejects)
+                        if max_depth is None or depth < max_depth:
+                            for entry in directories:
+                                pending[pool.submit(_list, entry.path)] = \
+                                    (depth + 1, entry.path)
+                        for entry in files:
+                            yield entry
+        finally:
+            # stopped early (break/close): queued listings are cancelled
+            # rather than completed when the pool shuts down
+            for future in pending:
+                future.cancel()
+            for depth, path, future in stack:
+                future.cancel()
+
+
+def walk_names(root, max_depth=None, workers=WORKERS, ordered=False,
+               rejects=None):
+    '''
+    Yields the files below root parsed as Sample or Samplesheet (with path)
+    Names that fail validation and unreadable directories are skipped and
+    appended to rejects (list) as (path, error) if provided
+    '''
+    for entry in walk_files(root, max_depth, workers, ordered, rejects):
+        parsed = classify(entry.path)
+        if not isinstance(parsed, Rejection):
+            yield parsed
+        elif rejects is not None:
+            rejects.append((entry.path, parsed.error))
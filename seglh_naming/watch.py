@@ -0,0 +1,162 @@
+'''
+Watches run folders and validates new files as they land
+
+Portable polling: each poll stats the watched directories and only lists
+(scandir) those whose mtime changed. New files are reported once their
+size and mtime have settled (partial writes are debounced), as events
+with the parsed Sample/Samplesheet or the validation error. Polls run in
+an executor, so dozens of run folders can be watched from one event loop.
+'''
+
+import os
+import time
+import asyncio
+from collections import namedtuple
+
+from .dispatch import classify, Rejection
+
+# seconds between polls
+POLL_INTERVAL = 2.0
+
+# seconds a new file must be unchanged before it is validated
+SETTLE_TIME = 5.0
+
+# directories modified within this many seconds of a poll are listed again
+# (coarse mtime resolution, e.g. on network filesystems)
+MTIME_RESOLUTION = 2.0
+
+# validated file (kind is 'sample', 'samplesheet' or 'error')
+Event = namedtuple('Event', ['kind', 'path', 'name', 'error'])
+
+
+class Watcher(object):
+    """
+    Incremental snapshots of run folders, polled for new files
+    """
+    def __init__(self, roots, interval=POLL_INTERVAL, settle=SETTLE_TIME,
+                 max_depth=None, existing=True):
+        '''
+        roots: watched run folders
+        max_depth: levels of subdirectories to watch (None for all)
+        existing: report the files present at the first poll
+        '''
+        self.roots = list(roots)
+        self.interval = interval
+        self.settle = settle
+        self.max_depth = max_depth
+        self._existing = existing
+        self._directories = dict((root, (0, None)) for root in self.roots)
+        self._listings = {}  # directory -> names of listed entries
+        self._pending = {}  # new file -> ((size, mtime), time of change)
+        self._polled = False
+
+    def _forget(self, directory):
+        '''
+        Drops a removed directory and its subdirectories
+        (roots are kept watched, e.g. until created)
+        '''
+        prefix = directory + os.sep
+        for path in list(self._directories):
+            if path == directory or path.startswith(prefix):
+                self._listings.pop(path, None)
+                if path in self.roots:
+                    self._directories[path] = (0, None)
+                else:
+                    del self._directories[path]
+        for path in list(self._pending):
+            if path.startswith(prefix):
+                del self._pending[path]
+
+    def _list(self, directory, depth, queue, report):
+        '''
+        Diffs a directory listing against the previous snapshot
+        '''
+        listed = self._listings.get(directory, set())
+        names = set()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                names.add(entry.name)
+                if entry.name in listed:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if self.max_depth is None or depth < self.max_depth:
+                        self._directories[entry.path] = (depth + 1, None)
+                        queue.append(entry.path)
+                elif entry.is_file() and report:
+                    self._pending[entry.path] = None
+        for name in listed - names:
+            path = os.path.join(directory, name)
+            self._pending.pop(path, None)
+            if path in self._directories:
+                self._forget(path)
+        self._listings[directory] = names
+
+    def poll(self):
+        '''
+        Diffs modified directories and validates settled new files
+            list of Event
+        '''
+        now = time.time()
+        queue = list(self._directories)
+        while queue:
+            directory = queue.pop()
+            if directory not in self._directories:
+                continue
+            depth, mtime = self._directories[directory]
+            try:
+                current = os.stat(directory).st_mtime
+            except OSError:
+                self._forget(directory)
+                continue
+            if current == mtime and now - current > MTIME_RESOLUTION:
+                continue
+            self._directories[directory] = (depth, current)
+            try:
+                # files present at the first poll are reported if existing
+                self._list(directory, depth, queue,
+                           self._existing or self._polled)
+            except OSError:
+                self._forget(directory)
+        self._polled = True
+        return self._settled()
+
+    def _settled(self):
+        '''
+        Validates new files unchanged for the settle time
+        '''
+        events = []
+        now = time.monotonic()
+        for path, previous in list(self._pending.items()):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                del self._pending[path]
+                continue
+            signature = (stat.st_size, stat.st_mtime)
+            if previous is None or previous[0] != signature:
+                self._pending[path] = (signature, now)
+            elif now - previous[1] >= self.settle:
+                del self._pending[path]
+                events.append(validate(path))
+        return events
+
+    async def events(self):
+        '''
+        Polls the run folders, yields Event for each new file
+        '''
+        loop = asyncio.get_running_loop()
+        while True:
+            for event in await loop.run_in_executor(None, self.poll):
+                yield event
+            await asyncio.sleep(self.interval)
+
+
+def validate(path):
+    '''
+    Classifies a file name as Sample or Samplesheet
+        Event
+    '''
+    parsed = classify(path)
+    if isinstance(parsed, Rejection):
+        return Event('error', path, None, parsed.error)
+    return Event(type(parsed).__name__.lower(), path, parsed, None)
@@ -9,4 +9,5 @@ setup(name='seglh_naming',
       license='Apache 2.0',
       packages=['seglh_naming'],
       install_requires=[],
+      python_requires='>=3.7',
       zip_safe=False)
@@ -0,0 +1,46 @@
+import pytest
+
+from seglh_naming.buffer import split_names
+from seglh_naming.sample import Sample
+from seglh_naming.samplesheet import Samplesheet
+
+####################
+# FIXTURES #########
+####################
+
+@pytest.fixture
+def names():
+    return [
+        "/some/path/NGS123_12_382398_JD_M_VCP0R33_Pan0000_S12_R1_001.fastq.gz",
+        "/some/path/NGS123_12_382398_JD_M_VCP0R33_Pan0000_S12_R2_001.fastq.gz",
+        "TSO22039_04_222480_2230347_Pan5085",
+        "/runs/211008_A01229_0040_AHKGTFDRXY_SampleSheet.csv",
+    ]
+
+####################
+# TESTS ############
+####################
+
+def test_split_nul(names):
+    buffer = b'\0'.join(n.encode() for n in names) + b'\0'
+    entries = list(split_names(buffer))
+    assert all(isinstance(e, memoryview) for e in entries)
+    assert [e.tobytes().decode() for e in entries] == names
+
+
+def test_split_lines(names):
+    buffer = b'\r\n'.join(n.encode() for n in names) + b'\n\n'
+    assert [e.tobytes().decode() for e in split_names(buffer)] == names
+    assert len(list(split_names(buffer, delimiter=b'\0'))) == 1
+
+
+def test_invalid_delimiter(names):
+    with pytest.raises(ValueError):
+        list(split_names(b'', delimiter=b','))
+
+
+def test_parse_entries(names):
+    entries = list(split_names('\n'.join(names).encode()))
+    for entry, name in zip(entries[:3], names[:3]):
+        assert repr(Sample.from_bytes(entry)) == name
+    assert repr(Samplesheet.from_bytes(entries[3])) == names[3]
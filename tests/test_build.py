@@ -0,0 +1,69 @@
+import pytest
+
+from seglh_naming.build import build_samples
+
+####################
+# FIXTURES #########
+####################
+
+@pytest.fixture
+def rows():
+    return [
+        {'id1': '382398', 'initials': 'JD', 'sex': 'M', 'panelnumber': 'Pan0000',
+         'well': 'A01'},
+        {'id1': '382399', 'id2': 'NA12878', 'panelnumber': 'Pan0000'},
+        {'samplecount': '03', 'id1': '382400', 'initials': 'AB', 'sex': 'F',
+         'panelnumber': 'Pan4009'},
+        {'id1': '382401', 'id2': '12345', 'panelnumber': 'Pan4009'},
+    ]
+
+####################
+# TESTS ############
+####################
+
+def test_build_samples(rows):
+    copies = [dict(row) for row in rows]
+    samples = build_samples(rows, libraryprep='NGS123')
+    assert [str(s) for s in samples] == [
+        'NGS123_01_382398_JD_M_Pan0000',
+        'NGS123_02_382399_NA12878_Pan0000',
+        'NGS123_03_382400_AB_F_Pan4009',
+        'NGS123_04_382401_12345_Pan4009',
+    ]
+    assert rows == copies
+
+
+def test_build_samples_start():
+    samples = build_samples(
+        [{'id1': '382398', 'id2': '12345', 'panelnumber': 'Pan0000'}] * 2,
+        libraryprep='NGS123', start=99)
+    assert [s.samplecount for s in samples] == ['99', '100']
+
+
+def test_build_samples_int_samplecount():
+    rows = [{'id1': '382398', 'id2': '12345', 'panelnumber': 'Pan0000'}] * 13
+    rows = [dict(rows[0], samplecount=12)] + rows[1:]
+    samples = build_samples(rows, libraryprep='NGS123')
+    assert [s.samplecount for s in samples] == \
+        ['12'] + ['{:02d}'.format(i) for i in range(1, 12)] + ['13']
+    rows[1] = dict(rows[1], samplecount=3)
+    rows[2] = dict(rows[2], samplecount='03')
+    with pytest.raises(ValueError, match=r'Row 3: Duplicate samplecount \(03, see row 2\)'):
+        build_samples(rows, libraryprep='NGS123')
+
+
+def test_build_samples_errors(rows):
+    rows[0]['initials'] = None
+    rows[1]['samplecount'] = '03'
+    rows[3]['panelnumber'] = 'Pan1'
+    rows.append({'libraryprep': 'TSO500', 'id1': '382402', 'id2': 'NA12878',
+                 'initials': 'JD', 'sex': 'M', 'panelname': 'LongPanelName',
+                 'panelnumber': 'Pan0000'})
+    with pytest.raises(ValueError) as e:
+        build_samples(rows, libraryprep='NGS123')
+    assert str(e.value) == (
+        'Row 1: Not enough identifiers in sample name (NGS123_01_382398_M_Pan0000), '
+        'Row 3: Duplicate samplecount (03, see row 2), '
+        'Row 4: Pan Number invalid (Pan1), '
+        'Row 5: TSO sample name too long (TSO500_04_382402_NA12878_JD_M_LongPanelName_Pan0000)'
+    )
@@ -0,0 +1,52 @@
+import pytest
+
+from seglh_naming import classify, classify_many, Rejection
+from seglh_naming.sample import Sample
+from seglh_naming.samplesheet import Samplesheet
+
+####################
+# FIXTURES #########
+####################
+
+@pytest.fixture
+def names():
+    return [
+        "/runs/211008_A01229_0040_AHKGTFDRXY_SampleSheet.csv",
+        "/runs/NGS123_01_382398_JD_M_VCP0R33_Pan0000_S1_R1_001.fastq.gz",
+        "/runs/RunInfo.xml",
+        "/runs/211008_A01229_40_AHKGTFDRXY_SampleSheet.csv",
+        "NGS123_01_382398_JD_M_VCP0R33_Pan1.bam",
+    ]
+
+####################
+# TESTS ############
+####################
+
+def test_classify(names):
+    samplesheet = classify(names[0])
+    assert isinstance(samplesheet, Samplesheet)
+    assert repr(samplesheet) == repr(Samplesheet.from_string(names[0]))
+    sample = classify(names[1])
+    assert isinstance(sample, Sample)
+    assert repr(sample) == repr(Sample.from_string(names[1]))
+    assert sample.path == '/runs'
+
+
+def test_classify_rejections(names):
+    assert classify(names[2]) == Rejection(
+        names[2], None, 'Wrong naming format (RunInfo.xml)')
+    assert classify(names[3]) == Rejection(
+        names[3], Samplesheet, 'Autoincrementing number invalid (40)')
+    assert classify(names[4]) == Rejection(
+        names[4], Sample, 'Pan Number invalid (Pan1)')
+
+
+def test_classify_lazy(names):
+    sample = classify(names[1], lazy=True)
+    assert sample.panelnumber == 'Pan0000'
+    assert '_pending' in sample.__dict__
+
+
+def test_classify_many(names):
+    assert [type(x) for x in classify_many(names)] == \
+        [Samplesheet, Sample, Rejection, Rejection, Rejection]
@@ -0,0 +1,43 @@
+import pytest
+
+from seglh_naming.extsort import sort_names
+
+####################
+# FIXTURES #########
+####################
+
+@pytest.fixture
+def listing():
+    names = []
+    for i in reversed(range(1, 60)):
+        for read in ('R2', 'R1'):
+            names.append("/archive/NGS123_{:02d}_382398_JD_M_VCP0R33_Pan0000_S{}_{}_001.fastq.gz"
+                         .format(i, i, read))
+    names.append("/archive/NGS123_05_382398_JD_M_VCP0R33_Pan0000_S5_R1_001.fastq.gz\n")
+    names.append("/archive/NGS123_05_382398_JD_M_VCP0R33_Pan0000.bam")
+    names.append("/archive/README.txt")
+    names.append("")
+    return names
+
+####################
+# TESTS ############
+####################
+
+def test_sort_names(listing):
+    rejects = []
+    groups = list(sort_names(listing, rejects=rejects))
+    assert [key for key, _ in groups] == sorted(key for key, _ in groups)
+    assert len(groups) == 59
+    assert groups[4] == ("NGS123_05_382398_JD_M_VCP0R33_Pan0000", [
+        "/archive/NGS123_05_382398_JD_M_VCP0R33_Pan0000.bam",
+        "/archive/NGS123_05_382398_JD_M_VCP0R33_Pan0000_S5_R1_001.fastq.gz",
+        "/archive/NGS123_05_382398_JD_M_VCP0R33_Pan0000_S5_R2_001.fastq.gz",
+    ])
+    assert rejects == ["/archive/README.txt"]
+
+
+def test_spill_to_disk(listing, tmp_path):
+    # small budget forces several sorted runs on disk
+    spilled = list(sort_names(listing, memory_limit=2000, tmpdir=str(tmp_path)))
+    assert spilled == list(sort_names(listing))
+    assert list(tmp_path.iterdir()) == []
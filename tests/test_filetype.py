@@ -0,0 +1,55 @@
+import pytest
+
+from seglh_naming.filetype import FileTypes, group_by_type
+from seglh_naming.sample import Sample
+
+####################
+# FIXTURES #########
+####################
+
+@pytest.fixture
+def files():
+    return [Sample.from_string(s) for s in [
+        "NGS123_01_382398_JD_M_VCP0R33_Pan0000_S1_R1_001.fastq.gz",
+        "NGS123_01_382398_JD_M_VCP0R33_Pan0000.realigned.bam",
+        "NGS123_01_382398_JD_M_VCP0R33_Pan0000.realigned.bam.bai",
+        "NGS123_01_382398_JD_M_VCP0R33_Pan0000.vcf.gz.tbi",
+        "NGS123_01_382398_JD_M_VCP0R33_Pan0000.vcf.gz",
+        "NGS123_01_382398_JD_M_VCP0R33_Pan0000.coverage.xyz",
+    ]]
+
+####################
+# TESTS ############
+####################
+
+def test_file_type(files):
+    assert [f.file_type for f in files] == \
+        ['fastq', 'bam', 'bai', 'tbi', 'vcf', None]
+    assert Sample.from_string("NGS123_01_382398_JD_M_VCP0R33_Pan0000").file_type is None
+
+
+def test_file_type_cached(files):
+    sample = files[4]
+    assert sample.file_extension() == 'vcf.gz'
+    assert '_file_suffix' in sample.__dict__
+    sample.rest = '.bed'
+    assert sample.file_type == 'bed'
+    assert sample.file_extension() == 'bed'
+    copy = sample.replace(rest='.cram')
+    assert copy.file_type == 'cram'
+    assert sample.file_type == 'bed'
+
+
+def test_register():
+    file_types = FileTypes(types={'vcf.gz': 'vcf'}, compressions=('gz',))
+    file_types.register('g.vcf.gz', 'gvcf')
+    assert file_types.file_type('_001.g.vcf.gz') == 'gvcf'
+    assert file_types.file_type('_001.vcf.gz') == 'vcf'
+    assert file_types.file_type('_001.bam') is None
+    assert file_types.parse('.realigned.vcf.gz') == ('vcf.gz', 'vcf', 'vcf')
+
+
+def test_group_by_type(files):
+    groups = group_by_type(files)
+    assert sorted(groups, key=str) == [None, 'bai', 'bam', 'fastq', 'tbi', 'vcf']
+    assert groups['bam'] == [files[1]]
@@ -0,0 +1,68 @@
+import pytest
+
+from seglh_naming.group import group_by_sample, find_incomplete
+from seglh_naming.sample import Sample
+
+####################
+# FIXTURES #########
+####################
+
+@pytest.fixture
+def files():
+    return [Sample.from_string(s) for s in [
+        "NGS123_01_382398_JD_M_VCP0R33_Pan0000_S1_R1_001.fastq.gz",
+        "NGS123_01_382398_JD_M_VCP0R33_Pan0000_S1_R2_001.fastq.gz",
+        "NGS123_01_382398_JD_M_VCP0R33_Pan0000.bam",
+        "NGS123_01_382398_JD_M_VCP0R33_Pan0000.bam.bai",
+        "NGS123_01_382398_JD_M_VCP0R33_Pan0000.vcf.gz",
+        "NGS123_02_382399_JF_F_VCP0R33_Pan0000_S2_R1_001.fastq.gz",
+        "NGS123_02_382399_JF_F_VCP0R33_Pan0000.realigned.bam",
+        "NGS123_02_382399_JF_F_VCP0R33_Pan0000",
+        "NGS123_03_382400_AB_F_VCP0R33_Pan0000_S3_L001_R1_001.fastq.gz",
+        "NGS123_03_382400_AB_F_VCP0R33_Pan0000_S3_L002_R1_001.fastq.gz",
+        "NGS123_03_382400_AB_F_VCP0R33_Pan0000_S3_L002_R2_001.fastq.gz",
+    ]]
+
+####################
+# TESTS ############
+####################
+
+def test_group_by_sample(files):
+    groups = group_by_sample(files)
+    assert sorted(groups) == ["NGS123_01_382398_JD_M_VCP0R33_Pan0000",
+                              "NGS123_02_382399_JF_F_VCP0R33_Pan0000",
+                              "NGS123_03_382400_AB_F_VCP0R33_Pan0000"]
+    sample = groups["NGS123_01_382398_JD_M_VCP0R33_Pan0000"]
+    assert sample['S1'][None]['R2']['fastq.gz'] == [files[1]]
+    assert sorted(sample[None][None][None]) == ['bai', 'bam', 'vcf.gz']
+    assert groups["NGS123_02_382399_JF_F_VCP0R33_Pan0000"][None][None][None][None] == [files[7]]
+    lanes = groups["NGS123_03_382400_AB_F_VCP0R33_Pan0000"]['S3']
+    assert sorted(lanes) == ['L001', 'L002']
+    assert lanes['L002']['R2']['fastq.gz'] == [files[10]]
+
+
+def test_find_incomplete(files):
+    assert sorted(find_incomplete(group_by_sample(files)), key=str) == [
+        ("NGS123_01_382398_JD_M_VCP0R33_Pan0000", None, None, None, 'vcf.gz', 'tbi'),
+        ("NGS123_02_382399_JF_F_VCP0R33_Pan0000", 'S2', None, 'R1', 'fastq.gz', 'R2'),
+        ("NGS123_02_382399_JF_F_VCP0R33_Pan0000", None, None, None, 'realigned.bam', 'bai'),
+        ("NGS123_03_382400_AB_F_VCP0R33_Pan0000", 'S3', 'L001', 'R1', 'fastq.gz', 'R2'),
+    ]
+    assert find_incomplete(group_by_sample(files[:4])) == []
+
+
+def test_find_incomplete_companions():
+    files = [Sample.from_string("NGS123_01_382398_JD_M_VCP0R33_Pan0000" + rest)
+             for rest in ('.bam', '.realigned.bam', '.bam.bai', '.cram', '.crai')]
+    # the BAI of one BAM does not cover the other, X.crai covers X.cram
+    assert find_incomplete(group_by_sample(files)) == [
+        ("NGS123_01_382398_JD_M_VCP0R33_Pan0000", None, None, None, 'realigned.bam', 'bai'),
+    ]
+
+
+def test_find_incomplete_lanes(files):
+    # R1 on two lanes without any R2
+    assert find_incomplete(group_by_sample([files[8], files[9]])) == [
+        ("NGS123_03_382400_AB_F_VCP0R33_Pan0000", 'S3', 'L001', 'R1', 'fastq.gz', 'R2'),
+        ("NGS123_03_382400_AB_F_VCP0R33_Pan0000", 'S3', 'L002', 'R1', 'fastq.gz', 'R2'),
+    ]
@@ -0,0 +1,84 @@
+import pytest
+
+from seglh_naming.identity import IdentityChecker, Conflict
+from seglh_naming.sample import Sample
+
+####################
+# FIXTURES #########
+####################
+
+@pytest.fixture
+def history():
+    return [Sample.from_string(s) for s in [
+        "/runs/1/NGS123_01_382398_JD_M_VCP0R33_Pan0000.bam",
+        "/runs/1/NGS123_02_382399_12345_Pan0000.bam",
+        "/runs/2/NGS124_05_382398_JD_M_Pan0000.bam",
+        "/runs/2/NGS124_06_382399_12345_JF_F_Pan0000.bam",
+    ]]
+
+
+@pytest.fixture
+def run():
+    return [Sample.from_string(s) for s in [
+        "/runs/3/NGS125_01_382398_JD_F_Pan0000_S1_R1_001.fastq.gz",
+        "/runs/3/NGS125_01_382398_JD_F_Pan0000_S1_R2_001.fastq.gz",
+        "/runs/3/NGS125_02_382399_54321_JF_F_Pan0000.bam",
+    ]]
+
+####################
+# TESTS ############
+####################
+
+def test_consistent(history):
+    checker = IdentityChecker()
+    assert list(checker.update(history)) == []
+    assert len(checker) == 2
+
+
+def test_conflicts(history, run):
+    checker = IdentityChecker()
+    list(checker.update(history))
+    assert list(checker.update(run)) == [
+        Conflict('382398', 'sex', 'F',
+                 '/runs/3/NGS125_01_382398_JD_F_Pan0000_S1_R1_001.fastq.gz',
+                 'M', '/runs/1/NGS123_01_382398_JD_M_VCP0R33_Pan0000.bam'),
+        Conflict('382399', 'id2', '54321',
+                 '/runs/3/NGS125_02_382399_54321_JF_F_Pan0000.bam',
+                 '12345', '/runs/1/NGS123_02_382399_12345_Pan0000.bam'),
+    ]
+    # conflicts are reported again for every new source
+    assert checker.check(run[0], source='rerun') == [
+        Conflict('382398', 'sex', 'F', 'rerun',
+                 'M', '/runs/1/NGS123_01_382398_JD_M_VCP0R33_Pan0000.bam'),
+    ]
+
+
+def test_controls():
+    controls = [Sample.from_string(s) for s in [
+        "NGS123_20_000000_NTC000_VCP0R33_Pan0000",
+        "NGS123_21_000000_NA12878_VCP0R33_Pan0000",
+        "NGS123_22_000000_HD200_VCP0R33_Pan0000",
+    ]]
+    checker = IdentityChecker()
+    assert list(checker.update(controls)) == []
+    assert len(checker) == 0
+    checker = IdentityChecker(controls=())
+    assert [c.value for c in checker.update(controls)] == ['NA12878', 'HD200']
+
+
+def test_save_load(tmpdir, history, run):
+    checker = IdentityChecker()
+    list(checker.update(history + run[:1]))
+    path = str(tmpdir.join('identities.json'))
+    checker.save(path)
+    loaded = IdentityChecker.load(path)
+    assert len(loaded) == 2
+    # conflicts of the saved history are reported for the new run
+    assert [c.field for c in loaded.update(run)] == ['sex', 'id2']
+
+
+def test_load_version(tmpdir):
+    path = tmpdir.join('identities.json')
+    path.write('{"version": 0}')
+    with pytest.raises(ValueError, match=r'Unsupported identity state version \(0\)'):
+        IdentityChecker.load(str(path))
@@ -0,0 +1,99 @@
+import sqlite3
+
+import pytest
+
+from seglh_naming.index import SampleIndex
+from seglh_naming.sample import Sample
+from seglh_naming.samplesheet import Samplesheet
+
+####################
+# FIXTURES #########
+####################
+
+@pytest.fixture
+def runs():
+    return [
+        ('211008_A01229_0040_AHKGTFDRXY_SampleSheet.csv', [
+            "NGS431_01_382398_JD_M_VCP0R33_Pan4009",
+            "NGS431_02_000000_NTC000_VCP0R33_Pan4009",
+            "NGS431_03_382400_AB_U_VCP0R33_Pan0000_RJZ",
+        ]),
+        ('220401_NB552085_0188_AHJWL5AFX3_SampleSheet.csv', [
+            "NGS432_01_382398_JD_M_VCP0R33_Pan4009",
+            "NGS432_02_000000_NTC000_VCP0R33_Pan4009",
+        ]),
+    ]
+
+
+@pytest.fixture
+def index(runs):
+    index = SampleIndex()
+    for samplesheet, samples in runs:
+        samplesheet = Samplesheet.from_string(samplesheet)
+        for sample in samples:
+            index.add(Sample.from_string(sample), samplesheet)
+    return index
+
+
+@pytest.fixture
+def queries():
+    return [
+        ({'id1': '382398'}, [0, 3]),
+        ({'panelnumber': 'Pan4009', 'since': '220101'}, [3, 4]),
+        ({'libraryprep': 'NGS431', 'id2': lambda x: x and x.startswith('NTC')}, [1]),
+        ({'ods': 'RJZ'}, [2]),
+        ({'flowcellid': 'AHKGTFDRXY', 'until': '211231'}, [0, 1, 2]),
+        ({'sequencerid': lambda x: x.startswith('NB')}, [3, 4]),
+        ({'id1': '000001'}, []),
+    ]
+
+####################
+# TESTS ############
+####################
+
+def test_query(index, queries):
+    samples = [sample for sample, samplesheet in index]
+    assert len(index) == 5
+    for criteria, positions in queries:
+        assert index.query(**criteria) == [samples[i] for i in positions]
+
+
+def test_unknown_key(index):
+    with pytest.raises(ValueError, match='Unknown index key'):
+        index.query(sequencerid='A01229')
+    with pytest.raises(ValueError, match='Unknown constituent'):
+        index.query(colour=lambda x: True)
+
+
+def test_persistence(index, queries, tmp_path):
+    path = str(tmp_path / 'index.sqlite')
+    index.save(path)
+    loaded = SampleIndex.load(path)
+    assert [(repr(a), repr(b)) for a, b in loaded] == \
+        [(repr(a), repr(b)) for a, b in index]
+    samples = [sample for sample, samplesheet in loaded]
+    for criteria, positions in queries:
+        assert loaded.query(**criteria) == [samples[i] for i in positions]
+
+
+def test_persistence_columns(index, tmp_path):
+    path = str(tmp_path / 'index.sqlite')
+    index.save(path)
+    connection = sqlite3.connect(path)
+    try:
+        assert connection.execute(
+            "SELECT sample FROM samples WHERE id1 = '382398' AND date >= '220101'"
+        ).fetchall() == [("NGS432_01_382398_JD_M_VCP0R33_Pan4009",)]
+        assert connection.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index'"
+        ).fetchone() == (7,)
+    finally:
+        connection.close()
+    # names are parsed when returned by a query, saved again unparsed
+    loaded = SampleIndex.load(path)
+    assert [repr(s) for s in loaded.query(ods='RJZ')] == \
+        ["NGS431_03_382400_AB_U_VCP0R33_Pan0000_RJZ"]
+    assert sum(isinstance(s, Sample) for s in loaded._samples) == 1
+    loaded.save(path)
+    assert [(repr(a), repr(b)) for a, b in SampleIndex.load(path)] == \
+        [(repr(a), repr(b)) for a, b in index]
@@ -0,0 +1,118 @@
+import pytest
+
+from seglh_naming.reconcile import reconcile, samplesheet_indexes
+from seglh_naming.sample import Sample
+from seglh_naming.samplesheet import read_samples
+
+####################
+# FIXTURES #########
+####################
+
+@pytest.fixture
+def samplesheet_samples():
+    return [Sample.from_string(s) for s in [
+        "NGS123_01_382398_JD_M_VCP0R33_Pan0000",
+        "NGS123_02_382399_JF_F_VCP0R33_Pan0000",
+        "NGS123_01_382398_JD_M_VCP0R33_Pan0000",  # second lane
+        "NGS123_03_382400_AB_U_VCP0R33_Pan0000",
+    ]]
+
+
+@pytest.fixture
+def run_files():
+    return [Sample.from_string(s) for s in [
+        "/run/NGS123_01_382398_JD_M_VCP0R33_Pan0000_S1_R1_001.fastq.gz",
+        "/run/NGS123_01_382398_JD_M_VCP0R33_Pan0000_S1_R2_001.fastq.gz",
+        "/run/NGS123_01_382398_JD_M_VCP0R33_Pan0000_S1_R1_001.bam",  # ignored
+        "/run/NGS123_02_382399_JF_F_VCP0R33_Pan0000_S2_R1_001.fastq.gz",
+        "/run/NGS123_03_382400_AB_U_VCP0R33_Pan0000_S2_R1_001.fastq.gz",  # mismatched
+        "/run/NGS123_03_382400_AB_U_VCP0R33_Pan0000_S3_R2_001.fastq.gz",
+        "/run/NGS123_04_382401_AB_U_VCP0R33_Pan0000_S4_R1_001.fastq.gz",  # extra
+        "/run/NGS123_02_382399_JF_F_VCP0R33_Pan0000_S2_I1_001.fastq.gz",  # extra
+    ]]
+
+
+@pytest.fixture
+def lane_samplesheet():
+    return [
+        '[Data]',
+        'Lane,Sample_ID',
+        '1,NGS123_01_382398_JD_M_VCP0R33_Pan0000',
+        '2,NGS123_01_382398_JD_M_VCP0R33_Pan0000',
+        '1,NGS123_02_382399_JF_F_VCP0R33_Pan0000',
+    ]
+
+
+@pytest.fixture
+def lane_files():
+    return [Sample.from_string(s) for s in [
+        "/run/NGS123_01_382398_JD_M_VCP0R33_Pan0000_S1_L001_R1_001.fastq.gz",
+        "/run/NGS123_01_382398_JD_M_VCP0R33_Pan0000_S1_L001_R2_001.fastq.gz",
+        "/run/NGS123_01_382398_JD_M_VCP0R33_Pan0000_S1_L002_R1_001.fastq.gz",
+        "/run/NGS123_01_382398_JD_M_VCP0R33_Pan0000_S1_L002_R2_001.fastq.gz",
+        "/run/NGS123_02_382399_JF_F_VCP0R33_Pan0000_S2_L001_R1_001.fastq.gz",
+        "/run/NGS123_02_382399_JF_F_VCP0R33_Pan0000_S2_L002_R1_001.fastq.gz",  # extra lane
+    ]]
+
+####################
+# TESTS ############
+####################
+
+def test_samplesheet_indexes(samplesheet_samples):
+    assert list(samplesheet_indexes(samplesheet_samples).values()) == ['S1', 'S2', 'S3']
+
+
+def test_reconcile(samplesheet_samples, run_files):
+    result = reconcile(samplesheet_samples, run_files)
+    assert result.missing == [
+        ("NGS123_02_382399_JF_F_VCP0R33_Pan0000", 'S2', None, 'R2'),
+        ("NGS123_03_382400_AB_U_VCP0R33_Pan0000", 'S3', None, 'R1'),
+    ]
+    assert result.extra == [run_files[6], run_files[7]]
+    assert result.mismatched == [run_files[4]]
+
+
+def test_reconcile_reads(samplesheet_samples, run_files):
+    result = reconcile(samplesheet_samples, run_files, reads=('R1', 'R2', 'I1'))
+    assert run_files[7] not in result.extra
+    assert ("NGS123_01_382398_JD_M_VCP0R33_Pan0000", 'S1', None, 'I1') in result.missing
+
+
+def test_reconcile_complete(samplesheet_samples):
+    files = [Sample.from_string("{}_{}_{}_001.fastq.gz".format(name, index, read))
+             for name, index in samplesheet_indexes(samplesheet_samples).items()
+             for read in ('R1', 'R2')]
+    assert reconcile(samplesheet_samples, files) == ([], [], [])
+
+
+def test_reconcile_lanes(lane_samplesheet, lane_files):
+    assert [f.lane for f in lane_files[:4]] == ['L001', 'L001', 'L002', 'L002']
+    assert [f.readnumber for f in lane_files[:4]] == ['R1', 'R2', 'R1', 'R2']
+    result = reconcile(read_samples(lane_samplesheet), lane_files)
+    assert result.missing == [
+        ("NGS123_02_382399_JF_F_VCP0R33_Pan0000", 'S2', 'L001', 'R2'),
+    ]
+    assert result.extra == [lane_files[5]]
+    assert result.mismatched == []
+
+
+def test_reconcile_lanes_without_lane_column(lane_samplesheet, lane_files):
+    lines = [line.split(',', 1)[-1] for line in lane_samplesheet]
+    samples = read_samples(lines[:3] + lines[4:])
+    result = reconcile(samples, lane_files)
+    assert result.missing == [
+        ("NGS123_02_382399_JF_F_VCP0R33_Pan0000", 'S2', 'L001', 'R2'),
+        ("NGS123_02_382399_JF_F_VCP0R33_Pan0000", 'S2', 'L002', 'R2'),
+    ]
+    assert result.extra == []
+
+
+def test_reconcile_lane_column_without_lane_split(lane_samplesheet, lane_files):
+    files = [Sample.from_string(repr(f).replace('_L001', ''))
+             for f in lane_files if f.lane == 'L001']
+    result = reconcile(read_samples(lane_samplesheet), files)
+    assert result.missing == [
+        ("NGS123_02_382399_JF_F_VCP0R33_Pan0000", 'S2', None, 'R2'),
+    ]
+    assert result.extra == []
+    assert result.mismatched == []
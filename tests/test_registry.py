@@ -0,0 +1,69 @@
+import os
+import pytest
+
+from seglh_naming.registry import Registry, Registries, load_registry
+from seglh_naming.sample import Sample
+
+####################
+# FIXTURES #########
+####################
+
+@pytest.fixture
+def registries(tmpdir):
+    tmpdir.join('ods.json').write('["RJZ", "RYJ"]')
+    tmpdir.join('panels.csv').write(
+        'panelnumber,panelname\nPan0000,VCP0R33\nPan4009,CRC\n')
+    tmpdir.join('libraryprep.csv').write('prefix\nNGS\nTSO\n')
+    return Registries(ods=str(tmpdir.join('ods.json')),
+                      panels=str(tmpdir.join('panels.csv')),
+                      libraryprep=str(tmpdir.join('libraryprep.csv')))
+
+####################
+# TESTS ############
+####################
+
+def test_load_registry(tmpdir):
+    path = tmpdir.join('panels.json')
+    path.write('{"Pan0000": "VCP0R33"}')
+    assert load_registry(str(path)) == {'Pan0000': 'VCP0R33'}
+    path = tmpdir.join('ods.csv')
+    path.write('ods\nRJZ\n\n')
+    assert load_registry(str(path)) == {'RJZ': None}
+
+
+def test_strict_sample(registries):
+    StrictSample = registries.strict()
+    assert issubclass(StrictSample, Sample)
+    sample = StrictSample.from_string('NGS123_12_382398_JD_M_VCP0R33_Pan0000_RJZ_S12_R1_001')
+    assert sample.ods == 'RJZ'
+    # default class is unchanged
+    Sample.from_string('ADX123_12_382398_JD_M_Pan1234_RAA')
+
+
+def test_strict_errors(registries):
+    StrictSample = registries.strict()
+    with pytest.raises(ValueError, match=(
+            r'Unknown LibraryPrep prefix \(ADX\), Unknown Pan Number \(Pan1234\), '
+            r'Unknown or invalid ODS code \(RAA\)')):
+        StrictSample.from_string('ADX123_12_382398_JD_M_Pan1234_RAA')
+    with pytest.raises(ValueError, match=r'Panel Name does not match Pan Number \(CRC\)'):
+        StrictSample.from_string('NGS123_12_382398_JD_M_CRC_Pan0000')
+    sample = StrictSample.from_string('NGS123_12_382398_JD_M_Pan0000')
+    with pytest.raises(ValueError, match=r'Unknown or invalid ODS code \(RAA\)'):
+        sample.replace(ods='RAA')
+
+
+def test_hot_reload(tmpdir):
+    path = tmpdir.join('ods.csv')
+    path.write('ods\nRJZ\n')
+    registry = Registry(str(path), interval=0)
+    assert 'RJZ' in registry
+    path.write('ods\nRJZ\nRYJ\n')
+    os.utime(str(path), (0, 0))
+    assert 'RYJ' in registry
+    assert len(registry) == 2
+    # unreadable files keep the loaded values
+    path.remove()
+    assert 'RYJ' in registry
+    with pytest.raises(OSError):
+        registry.reload()
@@ -0,0 +1,86 @@
+import os
+import pytest
+
+from seglh_naming.rename import RenamePlan, plan_renames, rollback
+
+####################
+# FIXTURES #########
+####################
+
+@pytest.fixture
+def run(tmpdir):
+    for name in [
+        "NGS123_01_382398_JD_M_VCP0R33_Pan0000_S1_R1_001.fastq.gz",
+        "NGS123_01_382398_JD_M_VCP0R33_Pan0000_S1_R2_001.fastq.gz",
+        "NGS123_02_382399_JF_F_VCP0R33_Pan0000.bam",
+        "NGS123_03_382400_AB_F_VCP0R33_Pan1234.bam",
+        "SampleSheet.csv",
+    ]:
+        tmpdir.join(name).write(name)
+    return str(tmpdir)
+
+####################
+# TESTS ############
+####################
+
+def test_plan_renames(run):
+    plan = plan_renames(run, panelnumber='Pan1234')
+    assert plan.is_valid
+    assert len(plan) == 3
+    assert plan.dry_run()[0].endswith(' -> NGS123_01_382398_JD_M_VCP0R33_Pan1234_S1_R1_001.fastq.gz')
+
+
+def test_plan_collisions(run):
+    plan = plan_renames(run, samplecount='03', id1='382400', initials='AB',
+                        panelnumber='Pan1234')
+    assert not plan.is_valid
+    assert plan.collisions == [("NGS123_03_382400_AB_F_VCP0R33_Pan1234.bam",
+                                ["NGS123_02_382399_JF_F_VCP0R33_Pan0000.bam"])]
+    with pytest.raises(ValueError, match=r'Rename plan invalid \(1 collisions, 0 errors\)'):
+        plan.apply(os.path.join(run, 'journal'))
+
+
+def test_plan_errors(run):
+    plan = plan_renames(run, libraryprep='TSO123', panelname='ExtremelyLongPanelName')
+    assert not plan.is_valid
+    assert len(plan.errors) == 4
+    assert plan.errors[0][1].startswith('TSO sample name too long')
+
+
+def test_apply_and_cycles(tmpdir):
+    for name in 'abc':
+        tmpdir.join(name).write(name)
+    plan = RenamePlan(str(tmpdir), [('a', 'b'), ('b', 'a'), ('c', 'd')],
+                      existing='abc')
+    assert plan.cycles == [['a', 'b']]
+    steps = plan.steps()
+    assert steps[0] == ('a', '.a.renaming')
+    assert steps.index(('b', 'a')) < steps.index(('.a.renaming', 'b'))
+    journal = str(tmpdir.join('journal'))
+    assert plan.apply(journal, batch_size=2) == 4
+    assert not os.path.exists(journal)
+    assert [tmpdir.join(name).read() for name in 'abd'] == ['b', 'a', 'c']
+
+
+def test_chain_order(tmpdir):
+    plan = RenamePlan(str(tmpdir), [('a', 'b'), ('b', 'c'), ('c', 'd')],
+                      existing='abc')
+    assert plan.steps() == [('c', 'd'), ('b', 'c'), ('a', 'b')]
+
+
+def test_apply_failure_rolled_back(tmpdir):
+    tmpdir.join('a').write('a')
+    plan = RenamePlan(str(tmpdir), [('a', 'b'), ('missing', 'c')])
+    with pytest.raises(OSError):
+        plan.apply(str(tmpdir.join('journal')))
+    assert tmpdir.join('a').read() == 'a'
+    assert not tmpdir.join('b').exists()
+
+
+def test_rollback(tmpdir):
+    tmpdir.join('b').write('a')
+    journal = tmpdir.join('journal')
+    journal.write('{0}/a\t{0}/b\n{0}/c\t{0}/d\n'.format(tmpdir))
+    assert rollback(str(journal)) == 1
+    assert tmpdir.join('a').read() == 'a'
+    assert not journal.exists()
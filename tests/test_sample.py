@@ -19,6 +19,7 @@ def valid_samples():
         "ADX22050_20_222643_2231675_CRC_Pan4396",
         "NGS123_12_382398_JD_M_VCP0R33_Pan0000_S12_R1",
         "NGS123_12_382398_JD_M_VCP0R33_Pan0000_S12_R1_001",
+        "NGS123_12_382398_JD_M_VCP0R33_Pan0000_S12_L001_R1_001.fastq.gz",
         "NGS123_12_382398_JD_M_VCP0R33_Pan0000_RJZ_S12_R1",
         "NGS123_12_382398_JD_M_VCP0R33_Pan0000.fasta",
         "NGS123_12_382398_265254_VCP0R33_Pan0000_S12_R1",
@@ -120,7 +121,13 @@ def constituents():
         ("SNP70_11_265254_4031238805_DM_M_SNPIDv2_Pan4009_RJZ_S12_R1", 'readnumber', 'R1'),
         ("NGS123_12_382398_JD_M_VCP0R33_Pan0000.fasta", 'initials', 'JD'),
         ("NGS123_12_382398_JD_M_VCP0R33_Pan0000.fasta", 'sex', 'M'),
-        ("NGS123_12_382398_265254_VCP0R33_Pan0000_S12_R1", 'sex', None)
+        ("NGS123_12_382398_265254_VCP0R33_Pan0000_S12_R1", 'sex', None),
+        ("NGS123_12_382398_265254_VCP0R33_Pan0000_S12_I1_001.fastq.gz", 'readnumber', 'I1'),
+        ("NGS123_12_382398_265254_VCP0R33_Pan0000_S12_L002_R2_001.fastq.gz", 'samplesheetindex', 'S12'),
+        ("NGS123_12_382398_265254_VCP0R33_Pan0000_S12_L002_R2_001.fastq.gz", 'lane', 'L002'),
+        ("NGS123_12_382398_265254_VCP0R33_Pan0000_S12_L002_R2_001.fastq.gz", 'readnumber', 'R2'),
+        ("NGS123_12_382398_265254_VCP0R33_Pan0000_S12_L002_R2_001.fastq.gz", 'rest', '.fastq.gz'),
+        ("NGS123_12_382398_265254_VCP0R33_Pan0000_S12_R1", 'lane', None),
     ]
 
 @pytest.fixture
@@ -245,6 +252,14 @@ def test_invalid_dict_samples(invalid_dict_samples):
             Sample.from_dict(samplename)
 
 
+def test_direct_construction():
+    sample = Sample(libraryprep='NGS123', samplecount='01', id1='382398',
+                    id2='12345', panelnumber='Pan0000')
+    assert repr(sample) == 'NGS123_01_382398_12345_Pan0000'
+    with pytest.raises(ValueError, match=r'Not enough identifiers in sample name \(NGS123_01_382398_Pan0000\)'):
+        Sample(libraryprep='NGS123', samplecount='01', id1='382398', panelnumber='Pan0000')
+
+
 def test_field_validation(field_validation):
     s = "NGS123_12_382398_003245_VCP0R33_Pan0000_S12_R1"
     for match_exception, field, value in field_validation:
@@ -323,3 +338,134 @@ def test_file_dict_paths(file_dict_paths):
         assert sample.path == path
         if isinstance(s, str):
             assert s == repr(sample)
+
+
+def test_from_bytes(valid_samples, file_paths):
+    for s in valid_samples:
+        sample = Sample.from_bytes(s.encode())
+        assert repr(sample) == repr(Sample.from_string(s))
+    for s, is_file, path in file_paths:
+        sample = Sample.from_bytes(memoryview(s.encode()))
+        assert sample.is_file == is_file
+        assert sample.path == path
+        assert s == repr(sample)
+
+
+def test_invalid_from_bytes(invalid_samples):
+    for samplename in invalid_samples:
+        with pytest.raises(ValueError):
+            Sample.from_bytes(bytearray(samplename.encode()))
+
+
+@pytest.fixture
+def sorted_samples():
+    return [
+        "NGS9_02_382398_JD_M_VCP0R33_Pan0000",
+        "NGS123_02_382398_JD_M_VCP0R33_Pan0000_S2_L001_R1_001.fastq.gz",
+        "NGS123_02_382398_JD_M_VCP0R33_Pan0000_S2_L001_R2_001.fastq.gz",
+        "NGS123_02_382398_JD_M_VCP0R33_Pan0000_S2_L002_R1_001.fastq.gz",
+        "NGS123_02_382398_JD_M_VCP0R33_Pan0000_S10_R1_001.fastq.gz",
+        "NGS123_10_382398_JD_M_VCP0R33_Pan0000",
+        "NGS123_100_382398_JD_M_VCP0R33_Pan0000",
+        "NGS123rpt_01_382398_JD_M_VCP0R33_Pan0000",
+        "NGS1230_01_382398_JD_M_VCP0R33_Pan0000",
+    ]
+
+
+def test_sort_key(sorted_samples):
+    samples = [Sample.from_string(s) for s in reversed(sorted_samples)]
+    assert [repr(s) for s in sorted(samples)] == sorted_samples
+    assert [repr(s) for s in sorted(samples, key=lambda s: s.sort_key)] == sorted_samples
+
+
+def test_comparison(sorted_samples):
+    a, b = Sample.from_string(sorted_samples[0]), Sample.from_string(sorted_samples[0])
+    assert a.sort_key == b.sort_key and a <= b and a >= b and not a < b
+    # equality and hash by identity
+    assert a != b and len({a: 1, b: 2}) == 2 and a in set([a])
+    c = Sample.from_string(sorted_samples[1])
+    assert a < c and c > a and a <= c and c >= a
+    # cached key is updated on modification
+    a.libraryprep = 'NGS999'
+    assert a > c and a > b
+
+
+def test_lazy(valid_samples, file_paths):
+    for s in valid_samples:
+        sample = Sample.from_string(s, lazy=True)
+        assert repr(sample) == s
+        assert sample.validate() is sample
+        assert not sample.is_modified
+    for s, is_file, path in file_paths:
+        sample = Sample.from_bytes(s.encode(), lazy=True)
+        assert sample.is_file == is_file
+        assert sample.path == path
+        assert repr(sample.validate()) == s
+
+
+def test_lazy_invalid(invalid_samples):
+    # fields are validated on access, all of them by validate
+    sample = Sample.from_string("NGS123_12_382398_J3_C_VCP0R33_Pan0000_S12_R1", lazy=True)
+    assert sample.libraryprep == 'NGS123'
+    assert sample.panelnumber == 'Pan0000'
+    with pytest.raises(ValueError, match='Sex invalid'):
+        sample.sex
+    with pytest.raises(ValueError, match='Initials invalid.*Sex invalid'):
+        sample.validate()
+    # a failed validate caches nothing
+    sample = Sample.from_string("NGS123_12_382398_JD_C_VCP0R33_Pan0000_S12_R1", lazy=True)
+    with pytest.raises(ValueError, match='Sex invalid'):
+        sample.validate()
+    with pytest.raises(ValueError, match='Sex invalid'):
+        sample.sex
+    assert sample.initials == 'JD'
+    # requirements are checked by validate
+    sample = Sample.from_string("NGS123_12_382398_Pan0000_S12_R1", lazy=True)
+    assert sample.panelnumber == 'Pan0000'
+    with pytest.raises(ValueError, match='Not enough identifiers'):
+        sample.validate()
+    for samplename in invalid_samples:
+        with pytest.raises(ValueError):
+            Sample.from_string(samplename, lazy=True).validate()
+
+
+def test_lazy_modified():
+    sample = Sample.from_bytes(b"NGS123_12_382398_JD_X_VCP0R33_Pan0000", lazy=True)
+    sample.sex = 'M'
+    assert sample.is_modified
+    assert str(sample.validate()) == "NGS123_12_382398_JD_M_VCP0R33_Pan0000"
+
+
+def test_replace(valid_samples):
+    samples = [Sample.from_string(s) for s in valid_samples]
+    for sample in samples:
+        replaced = sample.replace(panelnumber='Pan1234', path='/new')
+        assert replaced is not sample
+        assert replaced.panelnumber == 'Pan1234'
+        assert replaced.path == '/new'
+        assert replaced.is_modified and not sample.is_modified
+        assert repr(replaced) == repr(Sample.from_string(
+            '/new/' + repr(sample).replace(sample.panelnumber, 'Pan1234')))
+    replaced = Sample.replace_many(samples[:5], ods='RJZ')
+    assert [s.ods for s in replaced] == ['RJZ'] * 5
+    assert [s.ods for s in samples[:5]] == [None] * 5
+
+
+def test_replace_invalid():
+    sample = Sample.from_string("NGS123_12_382398_JD_M_VCP0R33_Pan0000_S12_R1")
+    with pytest.raises(ValueError, match='Pan Number invalid.*Sex invalid|Sex invalid.*Pan Number invalid'):
+        sample.replace(panelnumber='Pan1', sex='X')
+    with pytest.raises(ValueError, match='Unknown field'):
+        sample.replace(colour='red')
+    # requirements depending on changed fields
+    with pytest.raises(ValueError, match='Not enough identifiers'):
+        sample.replace(sex=None)
+    with pytest.raises(ValueError, match='TSO sample name too long \\(TSO123_12_'):
+        sample.replace(libraryprep='TSO123', panelname='VCP0R33VCP0R33VCP0R33')
+
+
+def test_from_dict_not_mutated(valid_dict_samples):
+    for s in valid_dict_samples:
+        constituents = dict(s)
+        Sample.from_dict(constituents)
+        assert constituents == s
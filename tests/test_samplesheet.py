@@ -1,5 +1,5 @@
 import pytest
-from seglh_naming.samplesheet import Samplesheet
+from seglh_naming.samplesheet import Samplesheet, read_samples
 
 ####################
 # FIXTURES #########
@@ -99,6 +99,38 @@ def multiple_errors():
          ['Sequencer ID invalid', 'SampleSheet string invalid', 'File extension invalid']),
     ]
 
+@pytest.fixture
+def samplesheet_content():
+    return [
+        '[Header],,',
+        'IEMFileVersion,4,',
+        'Experiment Name,NGS123,',
+        ',,',
+        '[Reads],,',
+        '151,,',
+        ',,',
+        '[Data],,',
+        'Lane,Sample_ID,Sample_Name',
+        '1,NGS123_01_382398_JD_M_VCP0R33_Pan0000,NGS123_01_382398_JD_M_VCP0R33_Pan0000',
+        '1,NGS123_02_382399_JF_F_VCP0R33_Pan0000,',
+        '2,NGS123_01_382398_JD_M_VCP0R33_Pan0000,',
+        ',,',
+    ]
+
+
+@pytest.fixture
+def invalid_samplesheet_content():
+    return [
+        ('[BCLConvert_Data]\nSample_ID\nNGS123_01_382398_JD_M_VCP0R33_Pan0000\n'
+         'NGS123_01_382399_JF_F_VCP0R33_Pan0000\n',
+         ['Row 4: Duplicate samplecount \\(01, see row 3\\)']),
+        ('[Data]\nSample_ID,Sample_Name\nNGS123_01_38_PT3_M_VCP0R33_Pan0000,\n'
+         'NGS123_02_382399_JF_F_VCP0R33_Pan0000,NGS123_02_382399_JF_C_VCP0R33_Pan0000\n',
+         ['Row 3: Wrong naming format', 'Row 4: Sex invalid']),
+        ('[Header]\nSample_ID\n', ['No data section']),
+        ('[Data]\nLane,Sample_Name\n', ['No Sample_ID column']),
+    ]
+
 ####################
 # TESTS ############
 ####################
@@ -168,4 +200,50 @@ def test_file_paths(file_paths):
         samplesheet = Samplesheet.from_string(s)
         assert samplesheet.path == path
         if isinstance(s, str):
-            assert s == repr(samplesheet)
\ No newline at end of file
+            assert s == repr(samplesheet)
+
+def test_from_bytes(valid_samplesheets, file_paths):
+    for s in valid_samplesheets:
+        assert repr(Samplesheet.from_bytes(s.encode())) == s
+    for s, path in file_paths:
+        samplesheet = Samplesheet.from_bytes(memoryview(s.encode()))
+        assert samplesheet.path == path
+        assert s == repr(samplesheet)
+
+
+def test_invalid_from_bytes(invalid_samplesheets):
+    for samplesheet in invalid_samplesheets:
+        with pytest.raises(ValueError):
+            Samplesheet.from_bytes(samplesheet.encode())
+
+
+def test_read_samples(samplesheet_content, tmp_path):
+    samples = read_samples(samplesheet_content)
+    assert [s.samplecount for s in samples] == ['01', '02', '01']
+    assert [s.lane for s in samples] == ['L001', 'L001', 'L002']
+    assert str(samples[2]) == 'NGS123_01_382398_JD_M_VCP0R33_Pan0000'
+    # v2 samplesheet
+    v2 = [line.replace('[Data]', '[BCLConvert_Data]') for line in samplesheet_content]
+    assert len(read_samples(v2)) == 3
+    # from file
+    path = tmp_path / '211008_A01229_0040_AHKGTFDRXY_SampleSheet.csv'
+    path.write_text('\n'.join(samplesheet_content))
+    samples = Samplesheet.from_string(str(path)).read_samples()
+    assert str(samples[1]) == 'NGS123_02_382399_JF_F_VCP0R33_Pan0000'
+
+
+def test_read_invalid_samples(invalid_samplesheet_content):
+    for content, match_exceptions in invalid_samplesheet_content:
+        for item in match_exceptions:
+            with pytest.raises(ValueError, match=item):
+                read_samples(content.splitlines())
+
+
+def test_sort_key(valid_samplesheets):
+    samplesheets = [Samplesheet.from_string(s) for s in valid_samplesheets]
+    assert [repr(s) for s in sorted(samplesheets)] == sorted(valid_samplesheets)
+    a, b = samplesheets[0], Samplesheet.from_string(valid_samplesheets[0])
+    assert a.sort_key == b.sort_key and a <= b and a >= b
+    assert a != b and len(set([a, b])) == 2
+    b.date = '991231'
+    assert a < b and b > a
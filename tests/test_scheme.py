@@ -0,0 +1,75 @@
+import pytest
+
+from seglh_naming.sample import Sample, SAMPLE_SCHEME
+from seglh_naming.samplesheet import Samplesheet
+from seglh_naming.scheme import Field, Scheme, Naming, build_class
+
+####################
+# FIXTURES #########
+####################
+
+@pytest.fixture
+def variant_sample():
+    # site variant with 4 character ODS codes
+    scheme = SAMPLE_SCHEME \
+        .replace(regex=SAMPLE_SCHEME.regex.replace('(R[A-Z0-9]{2})', '(R[A-Z0-9]{2,3})')) \
+        .replace_field('ods', rule=r'^R[A-Z0-9]{2,3}$')
+    return build_class('SiteSample', scheme, Sample)
+
+
+@pytest.fixture
+def run_scheme():
+    return Scheme(
+        regex=r'(\d{6})_(RUN\d+)(\.\w+)?$',
+        fields=[
+            Field('date', r'^\d{6}$', "Date invalid ({})"),
+            Field('run', r'^RUN\d{2,}$', "Run invalid ({})"),
+            Field('ext', r'^\.\w+$', "Extension invalid ({})", optional=True, default=''),
+        ],
+        short=['date', 'run'],
+        full=['date', 'run', 'ext'],
+        suffix='ext',
+    )
+
+####################
+# TESTS ############
+####################
+
+def test_variant(variant_sample):
+    name = "NGS123_12_382398_JD_M_VCP0R33_Pan0000_RJZ1_S12_R1_001.fastq.gz"
+    sample = variant_sample.from_string(name)
+    assert sample.ods == 'RJZ1'
+    assert repr(sample) == name
+    assert isinstance(sample, Sample)
+    assert sample.sort_key == variant_sample.from_string(name).sort_key
+    with pytest.raises(ValueError, match='Unknown or invalid ODS code'):
+        sample.ods = 'RJZ12'
+    # default scheme unchanged
+    assert Sample.from_string(name).ods == 'RJZ'
+
+
+def test_custom_scheme(run_scheme):
+    Run = build_class('Run', run_scheme, Naming)
+    run = Run.from_string('/data/221004_RUN01.tar')
+    assert (run.date, run.run, run.ext, run.path) == ('221004', 'RUN01', '.tar', '/data')
+    assert str(run) == '221004_RUN01'
+    assert repr(run) == '/data/221004_RUN01.tar'
+    assert Run.from_dict({'date': '221004', 'run': 'RUN01'}).ext == ''
+    with pytest.raises(ValueError, match='Run invalid \\(None\\)'):
+        Run.from_dict({'date': '221004'})
+    with pytest.raises(ValueError, match='Date invalid'):
+        run.date = '2210'
+
+
+def test_scheme_fields():
+    assert SAMPLE_SCHEME.field('id1').error == "Specimen/DNA number invalid ({})"
+    with pytest.raises(ValueError, match='Unknown field'):
+        SAMPLE_SCHEME.replace_field('colour', rule='.*')
+
+
+def test_not_comparable():
+    sample = Sample.from_string("NGS123_12_382398_JD_M_VCP0R33_Pan0000")
+    samplesheet = Samplesheet.from_string('211008_A01229_0040_AHKGTFDRXY_SampleSheet.csv')
+    assert sample != samplesheet
+    with pytest.raises(TypeError):
+        sample < samplesheet
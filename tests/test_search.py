@@ -0,0 +1,55 @@
+import pytest
+
+from seglh_naming.sample import Sample
+from seglh_naming.search import SampleSearch
+
+####################
+# FIXTURES #########
+####################
+
+@pytest.fixture
+def samples():
+    return [Sample.from_string(s) for s in [
+        "NGS431_01_382398_JD_M_VCP0R33_Pan4009",
+        "NGS431_02_382399_NA12878_U_VCP0R33_Pan4009",
+        "NGS432_01_382398_JD_M_VCP0R33_Pan4009",
+        "NGS514B_29_287637_LE_M_VCP1R134StG_Pan4821",
+        "TSO22039_01_220246_HD200_Pan5085",
+    ]]
+
+
+@pytest.fixture
+def queries():
+    return [
+        ("NGS431_0", {}, [0, 1]),
+        ("382398", {}, [0, 2]),
+        ("NA128", {}, [1]),
+        ("VCP1", {}, [3]),
+        ("NGS43", {'fields': ('libraryprep',), 'limit': 2}, [0, 1]),
+        ("NGS43", {}, [0, 1, 2]),
+        ("HD", {'fields': ('id1',)}, []),
+        ("XYZ", {}, []),
+    ]
+
+####################
+# TESTS ############
+####################
+
+def test_search(samples, queries):
+    search = SampleSearch(samples)
+    for prefix, options, positions in queries:
+        assert search.search(prefix, **options) == [samples[i] for i in positions]
+
+
+def test_incremental(samples, queries):
+    search = SampleSearch()
+    for sample in samples:
+        search.add(sample)
+    assert len(search) == len(samples)
+    for prefix, options, positions in queries:
+        assert search.search(prefix, **options) == [samples[i] for i in positions]
+
+
+def test_unknown_field(samples):
+    with pytest.raises(ValueError, match='Unknown search field'):
+        SampleSearch(samples).search('NGS', fields=('sex',))
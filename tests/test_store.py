@@ -0,0 +1,81 @@
+import pytest
+
+from seglh_naming.sample import Sample
+from seglh_naming.store import NameStore, write_store
+
+####################
+# FIXTURES #########
+####################
+
+@pytest.fixture
+def names():
+    return sorted(
+        "/archive/NGS{}/NGS{}_{:02d}_38{:04d}_JD_M_VCP0R33_Pan0000_S{}_{}_001.fastq.gz"
+        .format(run, run, i, i, i, read)
+        for run in (123, 124, 130)
+        for i in range(1, 25)
+        for read in ('R1', 'R2')
+    )
+
+
+@pytest.fixture
+def store(names, tmp_path):
+    path = str(tmp_path / 'names.fc')
+    # strings are validated, adjacent duplicates removed
+    assert write_store(path, [Sample.from_string(names[0])] + names, block_size=7) == len(names)
+    with NameStore(path) as store:
+        yield store
+
+####################
+# TESTS ############
+####################
+
+def test_lookup(store, names):
+    assert len(store) == len(names)
+    for name in names:
+        assert name in store
+        assert repr(store.get(name)) == name
+    assert store.get(names[0][:-3]) is None
+    assert "/archive/A" not in store
+    assert "/zzz" not in store
+
+
+def test_scan(store, names):
+    assert [repr(s) for s in store] == names
+    assert [repr(s) for s in store.scan(names[10], names[20])] == names[10:20]
+    assert [repr(s) for s in store.prefix("/archive/NGS124/")] == \
+        [n for n in names if n.startswith("/archive/NGS124/")]
+    assert list(store.prefix("/archive/NGS125/")) == []
+
+
+def test_empty_store(tmp_path):
+    path = str(tmp_path / 'empty.fc')
+    write_store(path, [])
+    with NameStore(path) as store:
+        assert len(store) == 0
+        assert "/archive/x" not in store
+        assert list(store) == []
+
+
+def test_write_listing(names, tmp_path):
+    listing = tmp_path / 'listing.txt'
+    listing.write_text(u''.join(name + '\n' for name in names))
+    path = str(tmp_path / 'names.fc')
+    with listing.open() as fh:
+        assert write_store(path, fh) == len(names)
+    with NameStore(path) as store:
+        assert [repr(s) for s in store] == names
+
+
+def test_write_unsorted(names, tmp_path):
+    path = tmp_path / 'names.fc'
+    with pytest.raises(ValueError, match='Names not sorted'):
+        write_store(str(path), names[1:] + names[:1])
+    assert not path.exists()
+
+
+def test_invalid_store(tmp_path):
+    path = tmp_path / 'invalid.fc'
+    path.write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError, match='Not a name store'):
+        NameStore(str(path))
@@ -0,0 +1,90 @@
+import random
+import pytest
+
+from seglh_naming.sample import Sample
+from seglh_naming.suggest import BKTree, Suggester, distance
+
+####################
+# FIXTURES #########
+####################
+
+@pytest.fixture
+def known_samples():
+    return [Sample.from_string(s) for s in [
+        "NGS431_01_382398_JD_M_VCP0R33_Pan4009",
+        "NGS431_02_382399_NA12878_U_VCP0R33_Pan4009",
+        "NGS514B_29_287637_LE_M_VCP1R134StG_Pan4821",
+        "ADX22050_20_222643_2231675_CRC_Pan4396",
+        "TSO22039_01_220246_HD200_Pan5085",
+    ]]
+
+
+@pytest.fixture
+def distances():
+    return [
+        ('VCP0R33', 'VCP0R33', 0),
+        ('VCP0R33', 'VCP0R3', 1),
+        ('VCP0R33', 'VCPR033', 1),  # transposition
+        ('Pan4009', 'Pan4900', 2),
+        ('', 'CRC', 3),
+        ('CA', 'ABC', 2),  # transposition with insertion in between
+        ('AC', 'CA', 1),
+    ]
+
+
+@pytest.fixture
+def corrections():
+    return [
+        ("NGS431_01_382398_JD_M_VCP0R33_Pan40O9",  # letter O instead of zero
+         "NGS431_01_382398_JD_M_VCP0R33_Pan4009"),
+        ("NGS431-01-382398-JD-M-VCP0R33-Pan4009",  # hyphens
+         "NGS431_01_382398_JD_M_VCP0R33_Pan4009"),
+        ("NGS431_01_382398_jd_m_VCP0R33_Pan4009",  # lowercase initials and sex
+         "NGS431_01_382398_JD_M_VCP0R33_Pan4009"),
+        ("NGS431_01_382398_M_JD_VCP0R33_Pan4009",  # swapped fields
+         "NGS431_01_382398_JD_M_VCP0R33_Pan4009"),
+        ("/run/ADX22050_20_222643_2231675_CRC_Pn4396",  # wrong naming format
+         "/run/ADX22050_20_222643_2231675_CRC_Pan4396"),
+        ("NS431_02_382399_NA12878_U_VCP0R33_Pan4009",  # libraryprep
+         "NGS431_02_382399_NA12878_U_VCP0R33_Pan4009"),
+    ]
+
+####################
+# TESTS ############
+####################
+
+def test_distance(distances):
+    for a, b, d in distances:
+        assert distance(a, b) == d
+        assert distance(b, a) == d
+
+
+def test_bktree():
+    values = ['Pan4009', 'Pan4821', 'Pan4396', 'Pan5085', 'Pan4009']
+    tree = BKTree(values)
+    assert len(tree) == 4
+    assert tree.search('Pan4090', 2) == [(1, 'Pan4009'), (2, 'Pan4396')]
+    assert tree.search('Pan4000', 1) == [(1, 'Pan4009')]
+    assert tree.search('XXX', 1) == []
+    assert BKTree().search('Pan4009', 2) == []
+    assert BKTree(['ABC', 'CA']).search('AC', 1) == [(1, 'ABC'), (1, 'CA')]
+
+
+def test_bktree_brute_force():
+    rng = random.Random(0)
+    values = [''.join(rng.choice('ABC') for _ in range(rng.randint(0, 6)))
+              for _ in range(200)]
+    tree = BKTree(values)
+    for query in values[:40]:
+        for max_distance in (1, 2, 3):
+            assert tree.search(query, max_distance) == sorted(set(
+                (distance(query, value), value) for value in values
+                if distance(query, value) <= max_distance))
+
+
+def test_suggest(known_samples, corrections):
+    suggester = Suggester(known_samples)
+    for invalid, expected in corrections:
+        assert suggester.suggest(invalid)[0] == expected
+    assert suggester.suggest(repr(known_samples[0])) == []
+    assert suggester.suggest("XXXXXX_01_000000") == []
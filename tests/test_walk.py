@@ -0,0 +1,94 @@
+import os
+import time
+import pytest
+
+from seglh_naming import walk
+from seglh_naming.walk import walk_files, walk_names
+from seglh_naming.sample import Sample
+from seglh_naming.samplesheet import Samplesheet
+
+####################
+# FIXTURES #########
+####################
+
+@pytest.fixture
+def run(tmpdir):
+    files = [
+        "211008_A01229_0040_AHKGTFDRXY_SampleSheet.csv",
+        "RunInfo.xml",
+        "fastq/NGS123_01_382398_JD_M_VCP0R33_Pan0000_S1_R1_001.fastq.gz",
+        "fastq/NGS123_01_382398_JD_M_VCP0R33_Pan0000_S1_R2_001.fastq.gz",
+        "fastq/Undetermined_S0_R1_001.fastq.gz",
+        "bam/NGS123_02_382399_JF_F_VCP0R33_Pan0000.bam",
+        "bam/qc/NGS123_02_382399_JF_F_VCP0R33_Pan0000.bam.stats",
+    ]
+    for name in files:
+        tmpdir.join(name).ensure()
+    return str(tmpdir)
+
+
+def relative(root, entries):
+    return [os.path.relpath(e.path, root) for e in entries]
+
+####################
+# TESTS ############
+####################
+
+def test_walk_files_ordered(run):
+    assert relative(run, walk_files(run, workers=4, ordered=True)) == [
+        "211008_A01229_0040_AHKGTFDRXY_SampleSheet.csv",
+        "RunInfo.xml",
+        "bam/NGS123_02_382399_JF_F_VCP0R33_Pan0000.bam",
+        "bam/qc/NGS123_02_382399_JF_F_VCP0R33_Pan0000.bam.stats",
+        "fastq/NGS123_01_382398_JD_M_VCP0R33_Pan0000_S1_R1_001.fastq.gz",
+        "fastq/NGS123_01_382398_JD_M_VCP0R33_Pan0000_S1_R2_001.fastq.gz",
+        "fastq/Undetermined_S0_R1_001.fastq.gz",
+    ]
+
+
+def test_walk_files_unordered(run):
+    ordered = relative(run, walk_files(run, ordered=True))
+    assert sorted(relative(run, walk_files(run))) == sorted(ordered)
+
+
+def test_walk_files_depth(run):
+    assert len(list(walk_files(run, max_depth=0))) == 2
+    assert len(list(walk_files(run, max_depth=1, ordered=True))) == 6
+
+
+def test_walk_files_unreadable(tmpdir):
+    missing = str(tmpdir.join('missing'))
+    rejects = []
+    assert list(walk_files(missing, rejects=rejects)) == []
+    assert rejects[0][0] == missing
+    with pytest.raises(OSError):
+        list(walk_files(missing))
+
+
+def test_walk_names(run):
+    rejects = []
+    names = list(walk_names(run, ordered=True, rejects=rejects))
+    assert [type(n) for n in names] == [Samplesheet, Sample, Sample, Sample, Sample]
+    assert names[1].path == os.path.join(run, 'bam')
+    assert [os.path.basename(path) for path, _ in rejects] == \
+        ["RunInfo.xml", "Undetermined_S0_R1_001.fastq.gz"]
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_walk_files_close(tmpdir, monkeypatch, ordered):
+    # queued listings are cancelled when the consumer stops early
+    tmpdir.join('first.txt').ensure()
+    for i in range(40):
+        tmpdir.join('{:02d}'.format(i), 'file.txt').ensure()
+    listed = []
+
+    def slow_list(path):
+        listed.append(path)
+        time.sleep(0.05)
+        return list_directory(path)
+    list_directory = walk._list
+    monkeypatch.setattr(walk, '_list', slow_list)
+    files = walk_files(str(tmpdir), workers=2, ordered=ordered)
+    assert next(files).name in ('first.txt', 'file.txt')
+    files.close()
+    assert len(listed) < 10
@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+
+from seglh_naming.watch import Watcher, validate
+from seglh_naming.sample import Sample
+from seglh_naming.samplesheet import Samplesheet
+
+####################
+# FIXTURES #########
+####################
+
+@pytest.fixture
+def run(tmpdir):
+    tmpdir.join("211008_A01229_0040_AHKGTFDRXY_SampleSheet.csv").write('')
+    return tmpdir
+
+####################
+# TESTS ############
+####################
+
+def test_validate():
+    event = validate("/runs/NGS123_01_382398_JD_M_VCP0R33_Pan0000.bam")
+    assert event.kind == 'sample'
+    assert isinstance(event.name, Sample)
+    event = validate("/runs/211008_A01229_0040_AHKGTFDRXY_SampleSheet.csv")
+    assert isinstance(event.name, Samplesheet)
+    event = validate("/runs/RunInfo.xml")
+    assert event.kind == 'error'
+    assert event.error.startswith('Wrong naming format')
+
+
+def test_poll_settles(run):
+    watcher = Watcher([str(run)], settle=0)
+    assert watcher.poll() == []  # first observation
+    assert [e.kind for e in watcher.poll()] == ['samplesheet']
+    fastq = run.join("fastq", "NGS123_01_382398_JD_M_VCP0R33_Pan0000_S1_R1_001.fastq.gz")
+    fastq.write('partial', ensure=True)
+    assert watcher.poll() == []
+    fastq.write('partial write', mode='a')
+    assert watcher.poll() == []  # size changed
+    events = watcher.poll()
+    assert [(e.kind, e.path) for e in events] == [('sample', str(fastq))]
+    assert watcher.poll() == []
+
+
+def test_poll_not_existing(run):
+    watcher = Watcher([str(run)], settle=0, existing=False)
+    watcher.poll()
+    run.join("RunInfo.xml").write('')
+    watcher.poll()
+    assert [e.kind for e in watcher.poll()] == ['error']
+
+
+def test_poll_max_depth(run):
+    watcher = Watcher([str(run)], settle=0, max_depth=0, existing=False)
+    watcher.poll()
+    run.join("fastq", "NGS123_01_382398_JD_M_VCP0R33_Pan0000.bam").ensure()
+    watcher.poll()
+    assert watcher.poll() == []
+
+
+def test_poll_removed(run):
+    watcher = Watcher([str(run.join('missing'))], settle=0)
+    assert watcher.poll() == []
+    run.join('missing', 'NGS123_01_382398_JD_M_VCP0R33_Pan0000.bam').ensure()
+    watcher.poll()
+    assert [e.kind for e in watcher.poll()] == ['sample']
+
+
+def test_events(run):
+    async def first():
+        events = Watcher([str(run)], interval=0.01, settle=0).events()
+        try:
+            return await asyncio.wait_for(events.__anext__(), 5)
+        finally:
+            await events.aclose()
+    assert asyncio.run(first()).kind == 'samplesheet'